@@ -1,6 +1,7 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import export, finish
 
 T_box = 51.3
 WH_corner = 65
@@ -27,12 +28,11 @@ corner = (cq.Workplane()
           .cutThruAll()
           )
 
-corner = (corner
-          .faces('not(+X or -Y or |Z)')
-          .edges()
-          .fillet(T_wall / 2 * 0.95)
+corner = (finish.Finish(corner)
+          .fillet(lambda wp: wp.faces('not(+X or -Y or |Z)'),
+                  T_wall / 2 * 0.95)
+          .build()
           )
 
 dir_out = 'models'
-os.makedirs(dir_out, exist_ok=True)
-exporters.export(corner, os.path.join(dir_out, 'box_corner.stl'))
+export.export(corner, os.path.join(dir_out, 'box_corner.stl'))
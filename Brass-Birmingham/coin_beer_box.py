@@ -1,7 +1,8 @@
 from typing import List
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import export
 
 tol_tight_fit = 0.1
 R_printer_fillet = 0.75
@@ -65,6 +66,5 @@ W_beer_slot = W_beer_box - 2 * T_wall
 beer_box = make_misc_box([W_beer_slot])
 
 dir_out = 'models'
-os.makedirs(dir_out, exist_ok=True)
-exporters.export(coin_box, os.path.join(dir_out, 'coin_box.stl'))
-exporters.export(beer_box, os.path.join(dir_out, 'beer_box.stl'))
+export.export(coin_box, os.path.join(dir_out, 'coin_box.stl'))
+export.export(beer_box, os.path.join(dir_out, 'beer_box.stl'))
@@ -1,6 +1,7 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import catalog, export, finish
 
 tol_tight_fit = 0.1
 R_printer_fillet = 0.75
@@ -14,8 +15,9 @@ T_wall = 1.75
 H_box_space = 227
 T_box_space = 27
 
-W_dragonshield = 66.7
-H_dragonshield = 92.6
+dragonshield = catalog.get('brass', 'sleeve', 'dragon_shield')
+W_dragonshield = dragonshield.W
+H_dragonshield = dragonshield.H
 
 N_slots = 3
 
@@ -55,18 +57,18 @@ for i in range(N_slots):
                    .extrude(-T_box_space, combine='cut')
                    )
 
-deck_holder = (deck_holder
-               .faces('<Z or >X or <X or >Y or <Y')
-               .edges()
-               .fillet(R_printer_fillet)
-               .edges('>Z')
-               .edges('not(>X or <X or >Y or <Y)')
-               .edges('not(>Y or <Y)')
-               .chamfer(T_card_chamfer)
+deck_holder = (finish.Finish(deck_holder)
+               .fillet(lambda wp: wp.faces('<Z or >X or <X or >Y or <Y'),
+                       R_printer_fillet)
+               .chamfer(lambda wp: (wp
+                                    .edges('>Z')
+                                    .edges('not(>X or <X or >Y or <Y)')
+                                    .edges('not(>Y or <Y)')),
+                        T_card_chamfer)
+               .build()
                )
 
 dir_out = 'models'
-os.makedirs(dir_out, exist_ok=True)
-exporters.export(deck_holder, os.path.join(dir_out, 'deck_holder.stl'))
+export.export(deck_holder, os.path.join(dir_out, 'deck_holder.stl'))
 
 print(W_deck_box, H_deck_box, T_deck_box)
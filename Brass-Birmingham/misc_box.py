@@ -1,6 +1,7 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import export
 
 tol_tight_fit = 0.1
 T_wall = 1.75
@@ -27,5 +28,4 @@ misc_box = (cq.Workplane()
             )
 
 dir_out = 'models'
-os.makedirs(dir_out, exist_ok=True)
-exporters.export(misc_box, os.path.join(dir_out, 'misc_box.stl'))
+export.export(misc_box, os.path.join(dir_out, 'misc_box.stl'))
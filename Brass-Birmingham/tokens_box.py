@@ -2,9 +2,10 @@ import cadquery as cq
 import enum
 import math
 import os
-from cadquery import exporters
 from typing import List, Optional
 
+from inserts import catalog, export, lean, threemf
+
 
 class Industry(enum.Enum):
     MANUFACTURER = enum.auto()
@@ -22,8 +23,9 @@ T_token_slot = 2
 
 T_finger_slot = 13
 
-W_industry_token = 25.5
-H_industry_token = 25.5
+industry_token = catalog.get('brass', 'token', 'industry')
+W_industry_token = industry_token.W
+H_industry_token = industry_token.H
 T_industry_tokens = {
     Industry.BREWERY: 15.1,
     Industry.MANUFACTURER: 24,
@@ -36,8 +38,9 @@ industry_order = [Industry.BREWERY, Industry.MANUFACTURER, Industry.COTTON_MILL,
                   Industry.COAL_MINE, Industry.POTTERY, Industry.IRON_WORK]
 N_industry_tokens = len(T_industry_tokens)
 
-W_link_token = 30.2  # Long side.
-H_link_token = 16.2
+link_token = catalog.get('brass', 'token', 'link')
+W_link_token = link_token.W  # Long side.
+H_link_token = link_token.H
 T_link_token = 15
 N_link_tokens = 2
 
@@ -157,7 +160,7 @@ def shrink_xy(w: cq.Workplane, x: float, y: Optional[float] = None
 # H_player_box = (3 * (H_industry_token + 2 * tol_tight_fit)
 #                 + H_link_token + 2 * tol_tight_fit
 #                 + 5 * T_dividing_wall)
-token_box = (cq.Workplane()
+token_box = (lean.Workplane()
              .box(H_player_box, W_player_box, T_player_box, centered=False)
              .edges().fillet(R_printer_fillet)
              )
@@ -274,5 +277,20 @@ token_box_compound = cq.Compound.makeCompound(vals)
 show_object(token_box_compound)
 
 dir_out = 'models'
-os.makedirs(dir_out, exist_ok=True)
-token_box_compound.exportStep(os.path.join(dir_out, 'token_box.step'))
+export.export(token_box_compound, os.path.join(dir_out, 'token_box.step'))
+
+# A box per player, with its icons in a second colour. The copies share
+# their meshes.
+color_box = '#303030'
+color_icon = '#e0c080'
+W_print_gap = 5
+token_boxes = threemf.Model()
+for i in range(N_players):
+    loc = cq.Location(cq.Vector(0, i * (W_player_box + W_print_gap), 0))
+    token_boxes.add(token_box.val().moved(loc), f'token_box {i + 1}',
+                    color=color_box)
+    for industry, icon in zip(industry_order, token_icons):
+        token_boxes.add(icon.val().moved(loc),
+                        f'{industry.name.lower()} icon {i + 1}',
+                        color=color_icon)
+export.export(token_boxes, os.path.join(dir_out, 'token_boxes.3mf'))
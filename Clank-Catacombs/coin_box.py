@@ -1,6 +1,6 @@
-import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import boxes, export
 
 W_box = 290
 H_market_box_outer = 65.8
@@ -15,12 +15,9 @@ T_wall = 1.2
 
 num_compartments = 3
 
-coin_box = (cq.Workplane()
-            .box(H_coin_box_outer - 2 * T_wall,
-                 W_coin_box_outer - 2 * T_wall,
-                 T_coin_box_outer - T_wall)
-            .faces('>Z')
-            .shell(T_wall)
+coin_box = (boxes.make_box(H_coin_box_outer - 2 * T_wall,
+                           W_coin_box_outer - 2 * T_wall,
+                           T_coin_box_outer - T_wall, T_wall)
             .faces('+Z').faces('<Z')
             .workplane()
             )
@@ -35,9 +32,5 @@ for i in range(num_compartments):
 
 coin_box = coin_box.extrude(T_coin_box_outer - T_wall)
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(coin_box, 'coin_box.stl')
-os.chdir(dir_cwd)
+export.export(coin_box, os.path.join(dir_models, 'coin_box.stl'))
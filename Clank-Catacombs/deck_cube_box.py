@@ -1,13 +1,14 @@
 import cadquery as cq
 import os
-import math
-from cadquery import exporters
+
+from inserts import boxes, catalog, export, vents
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
 
-H_card = 92.25
-W_card = 66.5
+card = catalog.get('clank', 'sleeve', 'sleeved_card')
+H_card = card.H
+W_card = card.W
 T_wall = 0.8
 T_player_inner_deck = 6.5
 T_player_inner_cube = 11.5
@@ -23,10 +24,8 @@ H_dungeon_finger_cutout = 5
 H_inner = H_card + 2 * tol_comfort
 W_inner = W_card + 2 * tol_comfort
 
-player_cube_inner = (cq.Workplane()
-                     .box(H_inner, W_inner, T_player_inner_cube)
-                     .faces('>Z')
-                     .shell(T_wall)
+player_cube_inner = (boxes.make_box(H_inner, W_inner, T_player_inner_cube,
+                                    T_wall)
                      .faces('+X').faces('<X')
                      .workplane()
                      .moveTo(W_inner / 2, T_player_inner_cube / 2)
@@ -69,54 +68,27 @@ T_slit = 7
 T_wall_vent = 2.5
 ratio = 1.9
 angle = 45  # degrees
-sketch_vents = (cq.Sketch()
-                .rarray(T_slit + T_wall_vent, 1,
-                        math.ceil(
-                            W_inner / math.cos(math.radians(angle)) /
-                            (T_slit + T_wall_vent)
-                        ) + 2, 1)
-                .rect(T_slit, H_inner / math.sin(math.radians(angle)))
-                )
-sketch_vents_support = (cq.Sketch()
-                        .rarray(ratio * (T_slit + T_wall_vent), 1,
-                        math.ceil(
-                            W_inner / math.cos(math.radians(angle)) /
-                            (T_slit + T_wall_vent)
-                        ) + 2, 1)
-                        .rect(T_wall_vent, H_inner / math.sin(math.radians(angle)))
-                        )
-
-r = (cq.Workplane()
-     .rect(H_inner - 2 * T_wall_vent, W_inner - 2 * T_wall_vent)
-     .extrude(T_wall)
-     )
-
-vents_support = (cq.Workplane()
-                 .placeSketch(sketch_vents_support)
-                 .extrude(T_wall)
-                 .rotateAboutCenter((0, 0, 1), -45)
-                 )
-vents = (cq.Workplane()
-         .placeSketch(sketch_vents)
-         .extrude(T_wall)
-         .rotateAboutCenter((0, 0, 1), 45)
-         .intersect(r)
-         .cut(vents_support)
-         .edges('|Z')
-         .fillet(0.6)
-         )
+pitch_vents = T_slit + T_wall_vent
+# Slots and supports each have a center line on an edge of the area.
+cells_vents = vents.diagonal(H_inner - 2 * T_wall_vent,
+                             W_inner - 2 * T_wall_vent,
+                             T_slit, T_wall_vent,
+                             angle=90 + angle,
+                             offset=pitch_vents / 2,
+                             support=T_wall_vent,
+                             support_pitch=ratio * pitch_vents,
+                             support_offset=ratio * pitch_vents / 2)
+vent_tool = vents.make_vents(cells_vents, T_wall, R=0.6)
 
 player_deck_box = (player_deck_box
-                   .cut(vents
+                   .cut(vent_tool
                         .translate((0, 0, T_player_outer / 2 - T_wall))
                         )
                    )
 
 T_dungeon_inner_fit = T_dungeon_inner_deck + T_wall + 2 * tol_tight_fit
-dungeon_deck_box = (cq.Workplane()
-                    .box(H_inner_fit, W_inner_fit, T_dungeon_inner_fit)
-                    .faces('>Y')
-                    .shell(T_wall)
+dungeon_deck_box = (boxes.make_box(H_inner_fit, W_inner_fit,
+                                   T_dungeon_inner_fit, T_wall, '>Y')
                     .faces('<Z')
                     .workplane(origin=(0, -T_wall / 2, 0))
                     .moveTo(W_finger_cutout / 2, W_outer / 2)
@@ -124,16 +96,14 @@ dungeon_deck_box = (cq.Workplane()
                                 H_finger_cutout)
                     .close()
                     .extrude(-(T_dungeon_inner_fit + T_wall), combine='cut')
-                    .cut(vents
+                    .cut(vent_tool
                          .translate((0, 0, (T_dungeon_inner_fit + 2 * T_wall) / 2 - T_wall))
                          )
                     )
 
 H_deck_outer = H_inner + 2 * T_wall
-dungeon_deck_inner = (cq.Workplane()
-                      .box(H_inner, W_inner, T_dungeon_inner_deck)
-                      .faces('>Z')
-                      .shell(T_wall)
+dungeon_deck_inner = (boxes.make_box(H_inner, W_inner, T_dungeon_inner_deck,
+                                     T_wall)
                       .faces('+Z').faces('<Z')
                       .workplane()
                       .rect(H_deck_outer, W_dungeon_finger_cutout)
@@ -149,17 +119,15 @@ dungeon_deck_inner = (cq.Workplane()
 # show_object(dungeon_deck_box)
 show_object(dungeon_deck_inner)
 
-# show_object(vents)
+# show_object(vent_tool)
 # show_object(player_deck_box)
-# show_object(vents_support)
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-# exporters.export(deck_inner, 'deck_inner.stl')
-exporters.export(player_cube_inner, 'player_cube_inner.stl')
-exporters.export(player_deck_box, 'player_deck_box.stl')
-exporters.export(dungeon_deck_inner, 'dungeon_deck_inner.stl')
-exporters.export(dungeon_deck_box, 'dungeon_deck_box.stl')
-os.chdir(dir_cwd)
+# export.export(deck_inner, os.path.join(dir_models, 'deck_inner.stl'))
+export.export(player_cube_inner,
+              os.path.join(dir_models, 'player_cube_inner.stl'))
+export.export(player_deck_box, os.path.join(dir_models, 'player_deck_box.stl'))
+export.export(dungeon_deck_inner,
+              os.path.join(dir_models, 'dungeon_deck_inner.stl'))
+export.export(dungeon_deck_box,
+              os.path.join(dir_models, 'dungeon_deck_box.stl'))
@@ -2,68 +2,18 @@ import os
 import cadquery as cq
 from typing import Type, Self
 
+from inserts import cardstack, catalog, export, lean
+from inserts.cache import shape_cache
+from inserts.catalog import CuboidSpec
 
-class CuboidSpec:
-    width: float = 0
-    height: float = 0
-    thickness: float = 0
 
-    @classmethod
-    @property
-    def W(cls: Type[Self]) -> float:
-        return cls.width
-
-    @classmethod
-    @property
-    def H(cls: Type[Self]) -> float:
-        return cls.height
-
-    @classmethod
-    @property
-    def T(cls: Type[Self]) -> float:
-        return cls.thickness
-
-
-class StandardCard(CuboidSpec):
-    width: float = 63
-    height: float = 88
-    thickness: float = 0.6
-
-
-class DragonShieldSleeve(CuboidSpec):
-    width: float = 66.4
-    height: float = 92.2
-    thickness: float = 0.6
-
-
-class SquareMapTile(CuboidSpec):
-    width: float = 100
-    height: float = 100
-    thickness: float = 1.6
-
-
-class StartingMapTile(CuboidSpec):
-    width: float = 100
-    height: float = 200
-    thickness: float = 1.6
-
-
-class GameBoxInner(CuboidSpec):
-    width: float = 291
-    height: float = 291
-    thickness: float = 78.5
-
-
-class PlayerToken(CuboidSpec):
-    width: float = 18
-    height: float = 18
-    thickness: float = 10.3
-
-
-class ClankCube(CuboidSpec):
-    width: float = 8.2
-    height: float = 8.2
-    thickness: float = 8.2
+StandardCard = catalog.get('clank', 'card', 'standard')
+DragonShieldSleeve = catalog.get('clank', 'sleeve', 'dragon_shield')
+SquareMapTile = catalog.get('clank', 'tile', 'square_map')
+StartingMapTile = catalog.get('clank', 'tile', 'starting_map')
+GameBoxInner = catalog.get('clank', 'box', 'game_box_inner')
+PlayerToken = catalog.get('clank', 'token', 'player')
+ClankCube = catalog.get('clank', 'token', 'clank_cube')
 
 
 class Gridfinity:
@@ -152,6 +102,7 @@ class Gridfinity:
                 )
 
     @classmethod
+    @shape_cache
     def _make_profile(cls: Type[Self],
                       W_top: float,
                       H_top: float,
@@ -212,7 +163,7 @@ class Gridfinity:
 
 
 # Create starting deck two piece holder.
-card: Type[CuboidSpec] = DragonShieldSleeve
+card: CuboidSpec = DragonShieldSleeve
 tol = 0.75  # Comfort tolerance.
 num_cards = 10
 
@@ -222,7 +173,7 @@ T_token_floor = 1
 T_token_inner = PlayerToken.T + 1 + T_pad
 T_token_all = T_token_floor + T_token_inner
 T_token_wall = 1.5
-T_cards = num_cards * card.T * 1.5  # Sleeves are extra puffy.
+T_cards = cardstack.thickness(card, num_cards)
 T_interface = Gridfinity.T_interface()
 T_inner = T_cards + T_pad
 T_floor = 0.05
@@ -251,7 +202,7 @@ H_token_inner = H_token - 2 * T_token_wall
 X_lip = (W_inner_max - 2 * W_clearance) / 2
 Y_lip = -H_outer / 2
 H_lip_from_wall = H_lip - T_wall
-card_holder = (cq.Workplane()
+card_holder = (lean.Workplane()
                .tag('base')
                .placeSketch(Gridfinity.module_profile(W_outer, H_outer))
                .extrude(T_all)
@@ -345,7 +296,7 @@ H_pad = 2.5
 T_expose = ClankCube.T + 2.5
 T_cut = T_token_inner - T_expose
 X_profile = H_token_inner / 2 - H_pad
-token_holder = (cq.Workplane()
+token_holder = (lean.Workplane()
                 .rect(W_token, H_token)
                 .extrude(T_token_all)
                 .faces('>Z')
@@ -402,7 +353,6 @@ show_object(token_holder, 'token holder')
 
 
 out_dir = 'models'
-os.makedirs(out_dir, exist_ok=True)
-cq.exporters.export(card_holder, os.path.join(out_dir, 'card_holder.stl'))
-cq.exporters.export(token_holder, os.path.join(out_dir, 'token_holder.stl'))
-cq.exporters.export(grid, os.path.join(out_dir, 'grid.stl'))
+export.export(card_holder, os.path.join(out_dir, 'card_holder.stl'))
+export.export(token_holder, os.path.join(out_dir, 'token_holder.stl'))
+export.export(grid, os.path.join(out_dir, 'grid.stl'))
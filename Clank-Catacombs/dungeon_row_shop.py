@@ -1,6 +1,7 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import catalog, export
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
@@ -8,7 +9,7 @@ tol_tight_fit = 0.16
 
 T_wall = 1.2
 
-W_card = 66.5
+W_card = catalog.get('clank', 'sleeve', 'sleeved_card').W
 
 H_card_slot = 3
 W_card_slot = W_card + 2
@@ -50,10 +51,7 @@ def card_holder(n_cards):
 half_dungeon_row_shop = card_holder(3)
 goblin_holder = card_holder(1)
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(goblin_holder, 'goblin_holder.stl')
-exporters.export(half_dungeon_row_shop, 'half_dungeon_row_shop.stl')
-os.chdir(dir_cwd)
+export.export(goblin_holder, os.path.join(dir_models, 'goblin_holder.stl'))
+export.export(half_dungeon_row_shop,
+              os.path.join(dir_models, 'half_dungeon_row_shop.stl'))
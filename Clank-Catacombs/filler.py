@@ -1,6 +1,7 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import boxes, export, finish, plates
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
@@ -29,47 +30,32 @@ deck_aligner = (cq.Workplane()
                 .moveTo(0, -W_deck_aligner / 2)
                 .rect(W_deck, H_deck, centered=(True, False))
                 .cutThruAll()
-                .fillet(T_wall)
                 )
+deck_aligner = finish.Finish(deck_aligner).fillet(None, T_wall).build()
 
 print(H_deck_aligner + H_tile_box)
 
 H_misc_box_inner = H_deck_aligner + H_tile_box - 2 * T_wall
 W_misc_box_inner = W_box - W_tile_box - 0.5 - 2 * T_wall
 T_misc_box_inner = T_deck / 3 - T_wall
-misc_box = (cq.Workplane()
-            .box(H_misc_box_inner, W_misc_box_inner, T_misc_box_inner)
-            .faces('>Z')
-            .shell(T_wall)
-            )
-
-half_misc_box = (cq.Workplane()
-                 .box((H_misc_box_inner - 2 * T_wall - tol_tight_fit) / 2,
-                      W_misc_box_inner,
-                      T_misc_box_inner)
-                 .faces('>Z')
-                 .shell(T_wall)
-                 )
+misc_box = boxes.make_box(H_misc_box_inner, W_misc_box_inner,
+                          T_misc_box_inner, T_wall)
+
+half_misc_box = boxes.make_box(
+    (H_misc_box_inner - 2 * T_wall - tol_tight_fit) / 2,
+    W_misc_box_inner, T_misc_box_inner, T_wall)
 
 H_tile_misc_box_inner = H_tile_box - 2 * T_wall
 W_tile_misc_box_inner = W_tile_box - 2 * T_wall
 T_tile_misc_box_inner = T_deck - 44 - T_wall
-tile_misc_box = (cq.Workplane()
-                 .box(H_tile_misc_box_inner,
-                      W_tile_misc_box_inner,
-                      T_tile_misc_box_inner)
-                 .faces('>Z')
-                 .shell(T_wall)
-                 )
+tile_misc_box = boxes.make_box(H_tile_misc_box_inner, W_tile_misc_box_inner,
+                               T_tile_misc_box_inner, T_wall)
 
 T_top_misc_box_outer = 31
 H_top_misc_box_outer = W_misc_box_inner + 2 * T_wall
 H_top_misc_box_support = 37.5
-top_misc_box = (cq.Workplane()
-                .box(H_misc_box_inner, W_misc_box_inner,
-                T_top_misc_box_outer - T_wall)
-                .faces('>Z')
-                .shell(T_wall)
+top_misc_box = (boxes.make_box(H_misc_box_inner, W_misc_box_inner,
+                               T_top_misc_box_outer - T_wall, T_wall)
                 .faces('>Z')
                 .workplane()
                 .moveTo(0, H_top_misc_box_outer / 2 - H_top_misc_box_support)
@@ -83,25 +69,28 @@ top_misc_box = (cq.Workplane()
 H_upper_filler_outer = H_market_box
 W_upper_filler_outer = (W_box - 0.5) / 2
 T_upper_filler_outer = 50.5
-upper_filler_box = (cq.Workplane()
-                    .box(H_upper_filler_outer - 2 * T_wall,
-                         W_upper_filler_outer - 2 * T_wall,
-                         T_upper_filler_outer - T_wall)
-                    .faces('>Z')
-                    .shell(T_wall)
-                    )
+upper_filler_box = boxes.make_box(H_upper_filler_outer - 2 * T_wall,
+                                  W_upper_filler_outer - 2 * T_wall,
+                                  T_upper_filler_outer - T_wall, T_wall)
 
 show_object(upper_filler_box)
 
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(deck_aligner, 'deck_aligner.stl')
-exporters.export(misc_box, 'misc_box.stl')
-exporters.export(half_misc_box, 'half_misc_box.stl')
-exporters.export(tile_misc_box, 'tile_misc_box.stl')
-exporters.export(top_misc_box, 'top_misc_box.stl')
-exporters.export(upper_filler_box, 'upper_filler_box.stl')
-os.chdir(dir_cwd)
+parts = {
+    'deck_aligner': deck_aligner,
+    'misc_box': misc_box,
+    'half_misc_box': half_misc_box,
+    'tile_misc_box': tile_misc_box,
+    'top_misc_box': top_misc_box,
+    'upper_filler_box': upper_filler_box,
+}
+for name, part in parts.items():
+    export.export(part, os.path.join(dir_models, f'{name}.stl'))
+
+# The misc boxes take a bed of at least 224 mm.
+W_bed = 256
+H_bed = 256
+plates.export_plates(plates.arrange(parts, W_bed, H_bed,
+                                    copies={'half_misc_box': 2}),
+                     os.path.join(dir_models, 'plate_{}.3mf'))
@@ -1,7 +1,8 @@
 import cadquery as cq
 import os
 import math
-from cadquery import exporters
+
+from inserts import catalog, export, finish
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
@@ -22,16 +23,18 @@ T_backpack = 3.2
 T_burglar_kit = 4.8
 T_crown = 4.8
 
-H_mastery_token = 20
-W_mastery_token = 20
-T_mastery_token = 6.6
+mastery_token = catalog.get('clank', 'token', 'mastery')
+H_mastery_token = mastery_token.H
+W_mastery_token = mastery_token.W
+T_mastery_token = mastery_token.T
 
 R_monkey_idol = 20.2 / 2
 T_monkey_idol = 4.8
 
-H_shop_token = 58.6
-W_shop_token = 130
-T_shop_token = 1.6
+shop_token = catalog.get('clank', 'token', 'shop')
+H_shop_token = shop_token.H
+W_shop_token = shop_token.W
+T_shop_token = shop_token.T
 
 H_shop_token_fit = H_shop_token + 2 * tol_comfort
 W_shop_token_fit = W_shop_token + 2 * tol_comfort
@@ -44,10 +47,12 @@ H_shop_outer = H_shop_token_fit + H_shop_token_slot + 3 * T_wall
 W_shop_outer = W_shop_token_slot + 2 * T_wall
 T_shop_outer = T_shop_token + H_market_item + 2 * tol_comfort + T_wall
 
-market_shop = (cq.Workplane()
-               .box(H_shop_outer, W_shop_outer, T_shop_outer)
-               .edges('|Z or <Z')
-               .fillet(T_wall)
+# Filleted before cutting: OCCT cannot fillet the bottom under the finger
+# slots afterwards.
+market_shop = (finish.Finish(cq.Workplane()
+                             .box(H_shop_outer, W_shop_outer, T_shop_outer))
+               .fillet('|Z or <Z', T_wall)
+               .build()
                )
 
 market_shop = market_shop.faces('>Z').workplane()
@@ -135,9 +140,5 @@ for i, (H_token, W_token, T_token, sep) in enumerate(
 
 print(T_shop_outer)
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(market_shop, 'market_shop.stl')
-os.chdir(dir_cwd)
+export.export(market_shop, os.path.join(dir_models, 'market_shop.stl'))
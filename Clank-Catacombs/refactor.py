@@ -3,76 +3,29 @@ import cadquery as cq
 import enum
 import itertools
 from dataclasses import dataclass
-from typing import List, Optional, Type, Self
+from typing import (Any, Callable, Hashable, List, Optional, Tuple, Type,
+                    TypeVar, Self)
 
 from cadquery.selectors import abstractmethod
 
+from inserts import cardstack, catalog, preview
+from inserts.cache import shape_cache
+from inserts.catalog import CuboidSpec
+
+T = TypeVar('T')
+
 '''
 Constants
 '''
 
 
-class CuboidSpec:
-    width: float = 0
-    height: float = 0
-    thickness: float = 0
-
-    @classmethod
-    @property
-    def W(cls: Type[Self]) -> float:
-        return cls.width
-
-    @classmethod
-    @property
-    def H(cls: Type[Self]) -> float:
-        return cls.height
-
-    @classmethod
-    @property
-    def T(cls: Type[Self]) -> float:
-        return cls.thickness
-
-
-class StandardCard(CuboidSpec):
-    width: float = 63
-    height: float = 88
-    thickness: float = 0.6
-
-
-class DragonShieldSleeve(CuboidSpec):
-    width: float = 66.4
-    height: float = 92.2
-    thickness: float = 0.6
-
-
-class SquareMapTile(CuboidSpec):
-    width: float = 100
-    height: float = 100
-    thickness: float = 1.6
-
-
-class StartingMapTile(CuboidSpec):
-    width: float = 100
-    height: float = 200
-    thickness: float = 1.6
-
-
-class GameBoxInner(CuboidSpec):
-    width: float = 291
-    height: float = 291
-    thickness: float = 78.5
-
-
-class PlayerToken(CuboidSpec):
-    width: float = 18
-    height: float = 18
-    thickness: float = 10.3
-
-
-class ClankCube(CuboidSpec):
-    width: float = 8.2
-    height: float = 8.2
-    thickness: float = 8.2
+StandardCard = catalog.get('clank', 'card', 'standard')
+DragonShieldSleeve = catalog.get('clank', 'sleeve', 'dragon_shield')
+SquareMapTile = catalog.get('clank', 'tile', 'square_map')
+StartingMapTile = catalog.get('clank', 'tile', 'starting_map')
+GameBoxInner = catalog.get('clank', 'box', 'game_box_inner')
+PlayerToken = catalog.get('clank', 'token', 'player')
+ClankCube = catalog.get('clank', 'token', 'clank_cube')
 
 
 '''
@@ -84,7 +37,7 @@ def rounded_rectangle(W: float, H: float, R: float) -> cq.Sketch:
     return cq.Sketch().rect(W, H).vertices().fillet(R)
 
 
-@dataclass
+@dataclass(frozen=True)
 class GridfinityProfile:
     T_top: float
     T_middle: float
@@ -143,6 +96,7 @@ class Gridfinity:
             R_top=R_top, R_middle=R_middle, R_bottom=R_bottom)
 
     @classmethod
+    @shape_cache
     def make_positive(cls: Type[Self], profile: GridfinityProfile,
                       W_top: float, H_top: float
                       ) -> cq.Workplane:
@@ -211,6 +165,8 @@ class GridfinityBuilder:
             module_profile = Gridfinity.define_module_profile()
         if stacking_lip_profile is None:
             stacking_lip_profile = Gridfinity.define_stacking_lip_profile()
+        if preview.active():
+            return preview.box(W, H, T)
 
         module = Gridfinity.make_positive(module_profile, W, H)
         T_no_interface = T - module_profile.T_all
@@ -225,6 +181,119 @@ class GridfinityBuilder:
 
         return module
 
+    @classmethod
+    def make_baseplate(cls: Type[Self],
+                       W: float, H: float,
+                       pitch: float = 42,
+                       profile: Optional[GridfinityProfile] = None,
+                       ) -> cq.Workplane:
+        '''Baseplate of W x H with as many cells as fit.
+
+        The space left over by the cells is split evenly between the margins.
+        '''
+        return cls.make_baseplate_tiles(W, H, W, H, pitch, profile)[0]
+
+    @classmethod
+    def make_baseplate_tiles(cls: Type[Self],
+                             W: float, H: float,
+                             W_max: float, H_max: float,
+                             pitch: float = 42,
+                             profile: Optional[GridfinityProfile] = None,
+                             ) -> List[cq.Workplane]:
+        '''Baseplate of W x H split into tiles of at most W_max x H_max.
+
+        Tiles are split at cell boundaries and stay where they are in the
+        whole baseplate. A single cell is cut from its square, then instanced
+        over the grid and fused with the margins in one operation. Cutting
+        all cell tools from a plate at once fails since neighbouring tools
+        touch along their top edges.
+        '''
+        if profile is None:
+            profile = Gridfinity.define_baseplate_profile()
+        N_W = int(W // pitch)
+        N_H = int(H // pitch)
+        if N_W == 0 or N_H == 0:
+            raise ValueError(f'No {pitch} mm cell fits in {W} x {H}')
+        if preview.active():
+            return [preview.box(x_max - x_min, y_max - y_min, profile.T_all)
+                    .translate(((x_min + x_max) / 2, (y_min + y_max) / 2, 0))
+                    for x_min, x_max, _, _ in cls._tile_bounds(W, N_W, pitch,
+                                                               W_max)
+                    for y_min, y_max, _, _ in cls._tile_bounds(H, N_H, pitch,
+                                                               H_max)]
+
+        cell = (cq.Workplane()
+                .rect(pitch, pitch)
+                .extrude(profile.T_all)
+                .cut(Gridfinity.make_positive(profile, pitch, pitch))
+                .val()
+                )
+
+        tiles = list()
+        for x_min, x_max, i_min, i_max in cls._tile_bounds(W, N_W, pitch,
+                                                           W_max):
+            for y_min, y_max, j_min, j_max in cls._tile_bounds(H, N_H, pitch,
+                                                               H_max):
+                parts = [cell.moved(cq.Location(cq.Vector(
+                             (i + 0.5) * pitch - N_W * pitch / 2,
+                             (j + 0.5) * pitch - N_H * pitch / 2,
+                             0)))
+                         for i in range(i_min, i_max)
+                         for j in range(j_min, j_max)]
+
+                W_tile = x_max - x_min
+                H_tile = y_max - y_min
+                W_cells = (i_max - i_min) * pitch
+                H_cells = (j_max - j_min) * pitch
+                if W_cells < W_tile or H_cells < H_tile:
+                    x_cells = (i_min + i_max - N_W) * pitch / 2
+                    y_cells = (j_min + j_max - N_H) * pitch / 2
+                    margins = (cq.Workplane()
+                               .center((x_min + x_max) / 2,
+                                       (y_min + y_max) / 2)
+                               .rect(W_tile, H_tile)
+                               .extrude(profile.T_all)
+                               .cut(cq.Workplane()
+                                    .center(x_cells, y_cells)
+                                    .rect(W_cells, H_cells)
+                                    .extrude(profile.T_all))
+                               )
+                    parts.append(margins.val())
+
+                tile = cq.Workplane(obj=parts[0])
+                if len(parts) > 1:
+                    tile = tile.union(
+                        cq.Workplane(obj=cq.Compound.makeCompound(parts[1:])),
+                        glue=True)
+                tiles.append(tile)
+        return tiles
+
+    @staticmethod
+    def _tile_bounds(L: float, N: int, pitch: float, L_max: float
+                     ) -> List[Tuple[float, float, int, int]]:
+        '''Splits N cells spanning L into as few tiles as fit in L_max.
+
+        Returns the extent and the range of cells of every tile.
+        '''
+        margin = (L - N * pitch) / 2
+        for N_tiles in range(1, N + 1):
+            bounds = list()
+            start = -L / 2
+            i_start = 0
+            for k in range(N_tiles):
+                i_end = i_start + N // N_tiles + (k < N % N_tiles)
+                end = start + (i_end - i_start) * pitch
+                if k == 0:
+                    end += margin
+                if k == N_tiles - 1:
+                    end += margin
+                bounds.append((start, end, i_start, i_end))
+                start = end
+                i_start = i_end
+            if all(end - start <= L_max for start, end, _, _ in bounds):
+                return bounds
+        raise ValueError(f'Cells of {pitch} mm cannot be tiled in {L_max}')
+
 
 '''
 Component elements.
@@ -250,19 +319,74 @@ class BoundingBox:
         return self.thickness
 
 
+# Revisions are unique across components, so a stack notices when one of its
+# components is swapped for another.
+_revisions = itertools.count(1)
+
+
 class Component(abc.ABC):
-    @abc.abstractproperty
+    '''Layout element with a solid (obj) and the space it takes (negative).
+
+    obj and negative are built on first access and cached. Setting any
+    attribute of the component invalidates the cache. In preview mode they
+    are cheap proxies, by default the bounding box of the component.
+    '''
+    __revision: int = 0
+
+    @property
     def obj(self: Self) -> Optional[cq.Workplane]:
-        ...
+        if preview.active():
+            return self._cached('obj', self._make_preview_obj)
+        return self._cached('obj', self._make_obj)
 
-    @abc.abstractproperty
+    @property
     def negative(self: Self) -> Optional[cq.Workplane]:
-        ...
+        if preview.active():
+            return self._cached('negative', self._make_preview_negative)
+        return self._cached('negative', self._make_negative)
 
     @abc.abstractproperty
     def BB(self: Self) -> BoundingBox:
         ...
 
+    @abstractmethod
+    def _make_obj(self: Self) -> Optional[cq.Workplane]:
+        ...
+
+    @abstractmethod
+    def _make_negative(self: Self) -> Optional[cq.Workplane]:
+        ...
+
+    def _make_preview_obj(self: Self) -> Optional[cq.Workplane]:
+        return preview.box(self.BB.W, self.BB.H, self.BB.T)
+
+    def _make_preview_negative(self: Self) -> Optional[cq.Workplane]:
+        return preview.box(self.BB.W, self.BB.H, self.BB.T)
+
+    @property
+    def _cache_key(self: Self) -> Hashable:
+        '''Changes whenever an input of the component changes.'''
+        return self.__revision
+
+    def _cached(self: Self, name: str, make: Callable[[], T]) -> T:
+        cache = self.__dict__.setdefault('_Component__cache', dict())
+        key = self._cache_key
+        # Proxies and solids are kept apart.
+        name = (name, preview.active())
+        entry = cache.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, make())
+            cache[name] = entry
+        return entry[1]
+
+    def _invalidate_cache(self: Self) -> None:
+        object.__setattr__(self, '_Component__revision', next(_revisions))
+
+    def __setattr__(self: Self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith('_Component__'):
+            self._invalidate_cache()
+
 
 class HAlignment(enum.Enum):
     LEFT = enum.auto()
@@ -276,7 +400,24 @@ class VAlignment(enum.Enum):
     BOTTOM = enum.auto()
 
 
-class Stackable:
+def make_compound(workplanes: List[cq.Workplane]) -> Optional[cq.Workplane]:
+    '''Collects the shapes of @workplanes onto a single workplane.
+
+    The shapes are kept as separate objects (rather than a single compound
+    that may self-intersect) so that a cut with the result is one boolean.
+    '''
+    vals = list()
+    for w in workplanes:
+        vals.extend(w.vals())
+    if not vals:
+        return None
+    return cq.Workplane().newObject(vals)
+
+
+class Stackable(Component):
+    # Axis (0: W, 1: H, 2: T) along which components are stacked.
+    _axis: int = 2
+
     def __init__(self: Self,
                  components: List[Component],
                  ha: HAlignment = HAlignment.CENTER,
@@ -284,32 +425,68 @@ class Stackable:
                  reversed: bool = False
                  ) -> None:
         self._components = components
-        self.__bb: Optional[BoundingBox] = None
         self._ha = ha
         self._va = va
         self._reversed = reversed
 
-    @abc.abstractproperty
+    @property
     def objs(self: Self) -> List[cq.Workplane]:
-        ...
+        return self._cached('objs', self._make_objs)
 
-    @abc.abstractproperty
+    @property
     def negatives(self: Self) -> List[cq.Workplane]:
-        ...
+        return self._cached('negatives', self._make_negatives)
 
     @property
     def BB(self: Self) -> BoundingBox:
-        if self.__bb is None:
-            self.__bb = self._compute_bb()
-        return self.__bb
+        return self._cached('BB', self._compute_bb)
+
+    @property
+    def _cache_key(self: Self) -> Hashable:
+        return (super()._cache_key,
+                tuple(c._cache_key for c in self._components))
+
+    def _make_objs(self: Self) -> List[cq.Workplane]:
+        objects = list()
+        for c, offset in zip(self.components, self._offsets):
+            obj = c.obj
+            if obj is not None:
+                objects.append(obj.translate(offset))
+        return objects
+
+    def _make_negatives(self: Self) -> List[cq.Workplane]:
+        negs = list()
+        for c, offset in zip(self.components, self._offsets):
+            neg = c.negative
+            if neg is not None:
+                negs.append(neg.translate(offset))
+        return negs
+
+    def _make_obj(self: Self) -> Optional[cq.Workplane]:
+        return make_compound(self.objs)
+
+    def _make_negative(self: Self) -> Optional[cq.Workplane]:
+        return make_compound(self.negatives)
+
+    # Stacks of proxies are proxies.
+    _make_preview_obj = _make_obj
+    _make_preview_negative = _make_negative
+
+    @property
+    def _prefix_Ws(self: Self) -> List[float]:
+        return self.__prefix([c.BB.W for c in self.components])
+
+    @property
+    def _prefix_Hs(self: Self) -> List[float]:
+        return self.__prefix([c.BB.H for c in self.components])
 
     @property
     def _prefix_Ts(self: Self) -> List[float]:
-        Ts = [c.BB.T for c in self.components]
-        cum_Ts = list(itertools.accumulate(Ts))
-        if cum_Ts:
-            return [0] + cum_Ts[:-1]
-        return list()
+        return self.__prefix([c.BB.T for c in self.components])
+
+    @property
+    def _offsets(self: Self) -> List[Tuple[float, float, float]]:
+        return self._cached('offsets', self._compute_checked_offsets)
 
     @property
     def components(self: Self) -> List[Component]:
@@ -318,19 +495,23 @@ class Stackable:
         return self._components
 
     def insert(self: Self, idx: int, component: Component) -> None:
-        self.__invalidate_cache()
+        self._invalidate_cache()
         self._components.insert(idx, component)
 
     def append(self: Self, component: Component) -> None:
-        self.__invalidate_cache()
+        self._invalidate_cache()
         self._components.append(component)
 
     def pop(self: Self, idx: int = -1) -> Component:
-        self.__invalidate_cache()
+        self._invalidate_cache()
         return self._components.pop(idx)
 
-    def __invalidate_cache(self: Self):
-        self.__bb = None
+    @staticmethod
+    def __prefix(sizes: List[float]) -> List[float]:
+        cum_sizes = list(itertools.accumulate(sizes))
+        if cum_sizes:
+            return [0] + cum_sizes[:-1]
+        return list()
 
     def _compute_bb(self: Self) -> BoundingBox:
         WHTs = list()
@@ -339,17 +520,34 @@ class Stackable:
             # bounding box every invokation).
             bb = c.BB
             WHTs.append((bb.W, bb.H, bb.T))
-        Ws, Hs, Ts = zip(*WHTs)
-        return BoundingBox(max(Ws), max(Hs), sum(Ts))
+        sizes = [list(s) for s in zip(*WHTs)]
+        return BoundingBox(*[sum(s) if axis == self._axis else max(s)
+                             for axis, s in enumerate(sizes)])
+
+    @abstractmethod
+    def _compute_offsets(self: Self) -> List[Tuple[float, float, float]]:
+        '''Returns the translation of each component in stacking order.'''
+        ...
+
+    def _compute_checked_offsets(self: Self
+                                 ) -> List[Tuple[float, float, float]]:
+        '''Offsets of the components, checked to keep them within the
+        bounding box of the stack on X & Y.
+        '''
+        offsets = self._compute_offsets()
+        for c, (x, y, _) in zip(self.components, offsets):
+            assert abs(x) + c.BB.W / 2 <= self.BB.W / 2 + 1e-6
+            assert abs(y) + c.BB.H / 2 <= self.BB.H / 2 + 1e-6
+        return offsets
 
     def _x_offset(self: Self, component: Component) -> float:
         if self._ha == HAlignment.CENTER:
             return 0
         diff = self.BB.W - component.BB.W
         if self._ha == HAlignment.LEFT:
-            return -diff
+            return -diff / 2
         elif self._ha == HAlignment.RIGHT:
-            return diff
+            return diff / 2
         raise RuntimeError
 
     def _y_offset(self: Self, component: Component) -> float:
@@ -357,45 +555,48 @@ class Stackable:
             return 0
         diff = self.BB.H - component.BB.H
         if self._va == VAlignment.TOP:
-            return diff
+            return diff / 2
         elif self._va == VAlignment.BOTTOM:
-            return -diff
+            return -diff / 2
         raise RuntimeError
 
 
 class HStack(Stackable):
+    '''Stacks components left to right along X.'''
+    _axis = 0
+
     def __init__(self: Self,
                  components: List[Component],
                  va: VAlignment = VAlignment.MIDDLE
                  ) -> None:
         super().__init__(components, va=va)
 
-    @property
-    def objs(self: Self) -> List[cq.Workplane]:
-        raise NotImplementedError
-
-    @property
-    def negatives(self: Self) -> List[cq.Workplane]:
-        raise NotImplementedError
+    def _compute_offsets(self: Self) -> List[Tuple[float, float, float]]:
+        X_left = -self.BB.W / 2
+        return [(X_left + W + c.BB.W / 2, self._y_offset(c), 0)
+                for c, W in zip(self.components, self._prefix_Ws)]
 
 
 class VStack(Stackable):
+    '''Stacks components top to bottom along Y.'''
+    _axis = 1
+
     def __init__(self: Self,
                  components: List[Component],
                  ha: HAlignment = HAlignment.CENTER
                  ) -> None:
-        super().__init__(components, ha=ha)
+        super().__init__(components, ha=ha, reversed=True)
 
-    @property
-    def objs(self: Self) -> List[cq.Workplane]:
-        raise NotImplementedError
-
-    @property
-    def negatives(self: Self) -> List[cq.Workplane]:
-        raise NotImplementedError
+    def _compute_offsets(self: Self) -> List[Tuple[float, float, float]]:
+        Y_bottom = -self.BB.H / 2
+        return [(self._x_offset(c), Y_bottom + H + c.BB.H / 2, 0)
+                for c, H in zip(self.components, self._prefix_Hs)]
 
 
 class ZStack(Stackable):
+    '''Stacks components top to bottom along Z.'''
+    _axis = 2
+
     def __init__(self: Self,
                  components: List[Component],
                  ha: HAlignment = HAlignment.CENTER,
@@ -403,32 +604,14 @@ class ZStack(Stackable):
                  ) -> None:
         super().__init__(components, ha=ha, va=va, reversed=True)
 
-    @property
-    def objs(self: Self) -> List[cq.Workplane]:
-        objects = list()
-        for c, T in zip(self.components, self._prefix_Ts):
-            obj = c.obj
-            if obj is not None:
-                objects.append(obj.translate((self._x_offset(c),
-                                              self._y_offset(c),
-                                              T)))
-        return objects
-
-    @property
-    def negatives(self: Self) -> List[cq.Workplane]:
-        negs = list()
-        for c, T in zip(self.components, self._prefix_Ts):
-            neg = c.negative
-            if neg is not None:
-                negs.append(neg.translate((self._x_offset(c),
-                                           self._y_offset(c),
-                                           T)))
-        return negs
+    def _compute_offsets(self: Self) -> List[Tuple[float, float, float]]:
+        return [(self._x_offset(c), self._y_offset(c), T)
+                for c, T in zip(self.components, self._prefix_Ts)]
 
 
 class CardHolder(Component):
     def __init__(self: Self,
-                 card: Type[CuboidSpec],
+                 card: CuboidSpec,
                  T: float,
                  R: float,
                  tol: float = 0.75
@@ -438,12 +621,13 @@ class CardHolder(Component):
         self._bb = BoundingBox(W, H, T)
         self._R = R
 
-    @property
-    def obj(self: Self) -> Optional[cq.Workplane]:
+    def _make_obj(self: Self) -> Optional[cq.Workplane]:
         return None
 
-    @property
-    def negative(self: Self) -> Optional[cq.Workplane]:
+    def _make_preview_obj(self: Self) -> Optional[cq.Workplane]:
+        return None
+
+    def _make_negative(self: Self) -> Optional[cq.Workplane]:
         profile = (cq.Sketch()
                    .rect(self.BB.W, self.BB.H)
                    .vertices('>Y')
@@ -486,8 +670,7 @@ class ClankTray(Component):
 
         self._bb = BoundingBox(self._W_outer, self._H_outer, self._T_all)
 
-    @property
-    def obj(self: Self) -> Optional[cq.Workplane]:
+    def _make_obj(self: Self) -> Optional[cq.Workplane]:
         W_tray_inner = self._W_inner - 2 * self._T_wall
         H_tray_inner = self._H_inner - 2 * self._T_wall
         T_tray_inner = self._T_inner - self._T_floor
@@ -546,8 +729,10 @@ class ClankTray(Component):
 
         return tray
 
-    @property
-    def negative(self: Self) -> Optional[cq.Workplane]:
+    def _make_preview_obj(self: Self) -> Optional[cq.Workplane]:
+        return preview.box(self._W_inner, self._H_inner, self._T_inner)
+
+    def _make_negative(self: Self) -> Optional[cq.Workplane]:
         return (cq.Workplane()
                 .placeSketch(rounded_rectangle(self._W_outer,
                                                self._H_outer,
@@ -562,7 +747,7 @@ class ClankTray(Component):
 
 card = DragonShieldSleeve
 num_cards = 10
-T_cards = (num_cards * card.T) * 1.5
+T_cards = cardstack.thickness(card, num_cards)
 module_profile = Gridfinity.define_module_profile()
 stacking_lip_profile = Gridfinity.define_stacking_lip_profile()
 
@@ -592,12 +777,10 @@ inner = (cq.Workplane()
 offset = (0, 0, module_profile.T_all)
 m = m.cut(inner.translate(offset))
 
-for negative in zs.negatives:
-    inner = inner.cut(negative)
+inner = inner.cut(zs.negative)
 m = m.union(inner.translate(offset))
 
-# for obj in zs.objs:
-#     show_object(obj.translate(offset))
+# show_object(zs.obj.translate(offset))
 
 T_module_wall = stacking_lip_profile.T_wall
 W_pad = 10
@@ -610,3 +793,14 @@ m = (m
      )
 show_object(m, 'module')
 # show_object(inner, 'inner')
+
+# Baseplate covering the box floor, in tiles that fit the printer bed. Its
+# tiles take about 10 s to build, so they are only shown on request.
+show_baseplate = False
+W_bed = 220
+H_bed = 220
+if show_baseplate:
+    baseplate_tiles = GridfinityBuilder.make_baseplate_tiles(
+        GameBoxInner.W, GameBoxInner.H, W_bed, H_bed)
+    for i, tile in enumerate(baseplate_tiles):
+        show_object(tile.translate((0, 0, -20)), f'baseplate {i}')
@@ -1,12 +1,14 @@
 import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import catalog, export
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
 
-H_card = 92.25
-W_card = 66.5
+card = catalog.get('clank', 'sleeve', 'sleeved_card')
+H_card = card.H
+W_card = card.W
 T_wall = 1.2
 
 T_card_slot = 7
@@ -76,9 +78,5 @@ reserve_shop = reserve_shop.extrude(-T_card_slot, combine='cut')
 #                 .shell(T_wall)
 #                 )
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(reserve_shop, 'reserve_shop.stl')
-os.chdir(dir_cwd)
+export.export(reserve_shop, os.path.join(dir_models, 'reserve_shop.stl'))
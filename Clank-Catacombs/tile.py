@@ -1,13 +1,14 @@
-import cadquery as cq
 import os
-from cadquery import exporters
+
+from inserts import boxes, catalog, export
 
 tol_comfort = 0.3
 tol_tight_fit = 0.16
 
-H_tile = 100
-W_tile = 100
-T_tile = 1.60
+tile = catalog.get('clank', 'tile', 'square_map')
+H_tile = tile.H
+W_tile = tile.W
+T_tile = tile.T
 T_tiles = 24
 
 T_wall = 2
@@ -20,10 +21,7 @@ H_box_inner = H_tile + 2 * tol_comfort
 T_box_inner = T_tiles + T_tile
 T_box_wall_inner = T_tiles
 
-tile_box = (cq.Workplane()
-            .box(H_box_inner, W_box_inner, T_box_inner)
-            .faces('>Z')
-            .shell(T_wall)
+tile_box = (boxes.make_box(H_box_inner, W_box_inner, T_box_inner, T_wall)
             .faces('+Z').faces('<Z')
             .workplane()
             .rect(H_box_inner, T_wall)
@@ -46,9 +44,5 @@ tile_box = (cq.Workplane()
 
 print(W_box_inner + 2 * T_wall)
 
-dir_cwd = os.getcwd()
 dir_models = 'models'
-os.makedirs(dir_models, exist_ok=True)
-os.chdir(dir_models)
-exporters.export(tile_box, 'tile_box.stl')
-os.chdir(dir_cwd)
+export.export(tile_box, os.path.join(dir_models, 'tile_box.stl'))
@@ -1 +1 @@
-PYTHONPATH=$(pwd):$PYTHONPATH cq-editor
+PYTHONPATH=$(pwd):$(dirname "$(pwd)"):$PYTHONPATH cq-editor
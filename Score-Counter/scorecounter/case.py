@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 import cadquery as cq
 import math
 from scorecounter.parameters import (
@@ -20,6 +20,8 @@ from scorecounter.parameters import (
     H_LOCK_BOLT, ANGLE_LOCK_BOLT, R_LOCK_BOLT, H_NUT_TOP, H_NUT_BOT,
     T_NUT, W_NUT
 )
+from inserts import lean
+from scorecounter import symmetry
 from scorecounter.geometry import _compute_closest_point_on_circle
 
 
@@ -133,7 +135,7 @@ def __compute_floor_interface() -> Tuple[int | float,
 def make_case_bump_side() -> cq.Workplane:
     W_inner = W_DIGIT_WHEEL_BUMP + 2 * TOL_MOVING
 
-    case = (cq.Workplane()
+    case = (lean.Workplane()
             .circle(R_CASE_CORE_BUMP)
             .extrude(T_CASE_CORE_WALL)
             .moveTo(-H_CASE_HALF, 0)
@@ -240,15 +242,18 @@ def make_case_bump_side() -> cq.Workplane:
     return case
 
 
-def make_case_opposite() -> cq.Workplane:
+def make_case_opposite(W_case_inner: Optional[int | float] = None
+                       ) -> cq.Workplane:
+    if W_case_inner is None:
+        W_case_inner = W_CASE_INNER
     W_bump_side_inner = W_DIGIT_WHEEL_BUMP + 2 * TOL_MOVING
-    W_inner = W_CASE_INNER - W_bump_side_inner
+    W_inner = W_case_inner - W_bump_side_inner
     x_side_i_center, y_side_i_center, H_side_i, T_side_i = \
         __compute_side_interface()
     x_floor_i_center, y_floor_i_center, H_floor_i, T_floor_i = \
         __compute_floor_interface()
 
-    case = (cq.Workplane()
+    case = (lean.Workplane()
             .circle(R_CASE_CORE_DIGIT)
             .extrude(T_CASE_CORE_WALL)
             .moveTo(-H_CASE_HALF, 0)
@@ -292,46 +297,50 @@ def make_case_opposite() -> cq.Workplane:
     T_cover_i_hook = 2 * T_WALL_MIN + TOL_TIGHT_FIT
     H_cover_i_hook = T_WALL_MIN + 2 * TOL_TIGHT_FIT
     W_cover_i_hook = W_case_all - 2 * W_COVER_INTERFACE_WALL
-    cover_tool_l = (cq.Workplane()
-                    .moveTo(-H_COVER_INTERFACE / 2,
-                            T_CASE / 2 - T_cover_i / 2)
-                    .rect(H_COVER_INTERFACE, T_cover_i)
-                    .extrude(W_case_all / 2, both=True)
-                    .moveTo(-H_COVER_INTERFACE + H_cover_i_hook / 2,
-                            T_CASE / 2 - T_cover_i_hook / 2)
-                    .rect(H_cover_i_hook, T_cover_i_hook)
-                    .extrude(W_cover_i_hook / 2, both=True)
-                    .faces('+Z')
-                    .faces('not(>Z)')
-                    .edges('>X')
-                    .chamfer((H_cover_i_hook - 0.1),
-                             (H_cover_i_hook - 0.1) * math.tan(ANGLE_OVERHANG))
-                    )
-    cover_tool_r = (cq.Workplane()
-                    .moveTo(-H_COVER_INTERFACE / 2,
-                            -(T_CASE / 2 - T_cover_i / 2))
-                    .rect(H_COVER_INTERFACE, T_cover_i)
-                    .extrude(W_case_all / 2, both=True)
-                    .moveTo(-H_COVER_INTERFACE + H_cover_i_hook / 2,
-                            -(T_CASE / 2 - T_cover_i_hook / 2))
-                    .rect(H_cover_i_hook, T_cover_i_hook)
-                    .extrude(W_cover_i_hook / 2, both=True)
-                    .faces('+Z')
-                    .faces('not(>Z)')
-                    .edges('>X')
-                    .chamfer((H_cover_i_hook - 0.1) * math.tan(ANGLE_OVERHANG),
-                             (H_cover_i_hook - 0.1))
-                    )
-    case = (case
-            .cut(cover_tool_l.translate((0, 0, W_case_all / 2)))
-            .cut(cover_tool_r.translate((0, 0, W_case_all / 2)))
-            )
+    # The tool of the left side, mirrored to the right side.
+    cover_tool = (cq.Workplane()
+                  .moveTo(-H_COVER_INTERFACE / 2,
+                          T_CASE / 2 - T_cover_i / 2)
+                  .rect(H_COVER_INTERFACE, T_cover_i)
+                  .extrude(W_case_all / 2, both=True)
+                  .moveTo(-H_COVER_INTERFACE + H_cover_i_hook / 2,
+                          T_CASE / 2 - T_cover_i_hook / 2)
+                  .rect(H_cover_i_hook, T_cover_i_hook)
+                  .extrude(W_cover_i_hook / 2, both=True)
+                  .faces('+Z')
+                  .faces('not(>Z)')
+                  .edges('>X')
+                  .chamfer((H_cover_i_hook - 0.1),
+                           (H_cover_i_hook - 0.1) * math.tan(ANGLE_OVERHANG))
+                  .translate((0, 0, W_case_all / 2))
+                  )
+    case = case.cut(symmetry.mirrored(cover_tool, 'XZ'))
     return case
 
 
-def make_digit_cover() -> cq.Workplane:
+def make_digit_cover(W_case_inner: Optional[int | float] = None,
+                     Z_bump_digit_center: Optional[int | float] = None,
+                     Z_mirror_digit_center: Optional[int | float] = None,
+                     W_digits: Optional[int | float] = None
+                     ) -> cq.Workplane:
+    '''Makes the cover of the digits.
+
+    The windows over the digits on the bump side and on the mirrored side are
+    W_digits wide and centered on the given Z, measured from the outside of
+    the opposite case. They default to those of the two digit counter.
+    '''
+    if W_case_inner is None:
+        W_case_inner = W_CASE_INNER
+    if Z_bump_digit_center is None:
+        Z_bump_digit_center = (T_CASE_CORE_WALL + W_WHEEL_ONES_MIRROR
+                               + 3 * TOL_MOVING + W_WHEEL_TENS)
+    if Z_mirror_digit_center is None:
+        Z_mirror_digit_center = (T_CASE_CORE_WALL + TOL_MOVING +
+                                 W_WHEEL_ONES_MIRROR)
+    if W_digits is None:
+        W_digits = 2 * W_DIGIT_CHARACTER + 2 * W_DIGIT_SPACING + 2 * TOL_MOVING
     W_bump_side_inner = W_DIGIT_WHEEL_BUMP + 2 * TOL_MOVING
-    W_case = W_CASE_INNER - W_bump_side_inner + T_CASE_CORE_WALL
+    W_case = W_case_inner - W_bump_side_inner + T_CASE_CORE_WALL
     W_cover = W_case - TOL_TIGHT_FIT
 
     R_digit_cover_inner = R_CASE_CORE_DIGIT + TOL_TIGHT_FIT
@@ -350,12 +359,7 @@ def make_digit_cover() -> cq.Workplane:
              .extrude(W_cover, combine='cut')
              )
 
-    Z_bump_digit_center = (T_CASE_CORE_WALL + W_WHEEL_ONES_MIRROR
-                           + 3 * TOL_MOVING + W_WHEEL_TENS)
-    Z_mirror_digit_center = (T_CASE_CORE_WALL + TOL_MOVING +
-                             W_WHEEL_ONES_MIRROR)
-    W_digit = min(2 * W_DIGIT_CHARACTER + 2 * W_DIGIT_SPACING + 2 * TOL_MOVING,
-                  2 * (W_cover - Z_bump_digit_center - T_WALL_MIN))
+    W_digit = min(W_digits, 2 * (W_cover - Z_bump_digit_center - T_WALL_MIN))
     angle_digit = math.radians(360 / len(DIGITS))
     digit_tool = (cq.Workplane()
                   .moveTo(0, 0)
@@ -368,15 +372,12 @@ def make_digit_cover() -> cq.Workplane:
                   .close()
                   .extrude(W_digit)
                   )
-    cover = (cover
-             # Cut digit slots.
-             .cut(digit_tool
-                  .translate((0, 0, Z_bump_digit_center - W_digit / 2))
-                  .rotate((0, 0, 0), (0, 0, 1), math.degrees(ANGLE_VIEWING)))
-             .cut(digit_tool
-                  .translate((0, 0, Z_mirror_digit_center - W_digit / 2))
-                  .rotate((0, 0, 0), (0, 0, 1), math.degrees(-ANGLE_VIEWING)))
-             )
+    # Cut digit slots.
+    cover = cover.cut(symmetry.placed(digit_tool, [
+        cq.Location(cq.Vector(), cq.Vector(0, 0, 1), math.degrees(angle))
+        * cq.Location(cq.Vector(0, 0, Z - W_digit / 2))
+        for Z, angle in ((Z_bump_digit_center, ANGLE_VIEWING),
+                         (Z_mirror_digit_center, -ANGLE_VIEWING))]))
     # Create interface.
     X_inner = TOL_TIGHT_FIT
     Y_inner = math.sqrt(R_digit_cover_inner ** 2 - X_inner ** 2)
@@ -479,15 +480,14 @@ def make_bolt() -> cq.Workplane:
             )
 
     lock = (lock
-            .union(bolt)
-            .union(bolt.rotate((0, 0, 0), (0, 0, 1), 180))
+            .union(symmetry.rotated(bolt, 2))
             )
     return lock
 
 
 if __name__ == '__cq_main__':
     import os
-    from cadquery import exporters
+    from inserts import export
     from scorecounter.parameters import DIR_EXPORT
 
     # wheel_bump = _make_wheel_bump()
@@ -495,12 +495,12 @@ if __name__ == '__cq_main__':
     # spring = (make_spring()
     #           .translate((0, 0, TOL_MOVING + (W_DIGIT_WHEEL_BUMP - W_SPRING) / 2))
     #           )
-    # exporters.export(spring, os.path.join(DIR_EXPORT, 'spring.stl'))
+    # export.export(spring, os.path.join(DIR_EXPORT, 'spring.stl'))
 
     case_bump = (make_case_bump_side()
                  .translate((0, 0, -T_CASE_CORE_WALL))
                  )
-    exporters.export(case_bump, os.path.join(DIR_EXPORT, 'case_bump.stl'))
+    export.export(case_bump, os.path.join(DIR_EXPORT, 'case_bump.stl'))
 
     # case_opposite = (make_case_opposite()
     #                  # .translate((0, 0, -T_CASE_CORE_WALL))
@@ -513,8 +513,8 @@ if __name__ == '__cq_main__':
     #                              W_DIGIT_WHEEL_BUMP + 2 * TOL_MOVING)
     #                             )
     #                  )
-    # exporters.export(case_opposite,
-    #                  os.path.join(DIR_EXPORT, 'case_opposite.stl'))
+    # export.export(case_opposite,
+    #               os.path.join(DIR_EXPORT, 'case_opposite.stl'))
 
     # digit_cover = (make_digit_cover()
     #                .translate((0, 0,
@@ -525,8 +525,8 @@ if __name__ == '__cq_main__':
     #                .translate((0, 0,
     #                            W_DIGIT_WHEEL_BUMP + 2 * TOL_MOVING))
     #                )
-    # exporters.export(digit_cover,
-    #                  os.path.join(DIR_EXPORT, 'digit_cover.stl'))
+    # export.export(digit_cover,
+    #               os.path.join(DIR_EXPORT, 'digit_cover.stl'))
 
     # bolt = make_bolt()
-    # exporters.export(bolt, os.path.join(DIR_EXPORT, 'bolt.stl'))
+    # export.export(bolt, os.path.join(DIR_EXPORT, 'bolt.stl'))
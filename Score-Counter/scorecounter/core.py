@@ -1,11 +1,12 @@
 import cadquery as cq
 import math
 from typing import Literal, Optional, Tuple
+from inserts import lean
 from scorecounter.parameters import (
     R_CORE_OUTER, R_CORE_INNER, R_PEG_CARRY, R_PEG, W_PEG, T_PEG_MIN,
     T_WALL_MIN, RG_DIGIT, SG_CARRY, SG_SHAFT, TOL_TIGHT_FIT, ANGLE_OVERHANG,
     R_PEG_CORE, R_SHAFT, R_PEG_CARRY_SUPPORT, W_CORE_ONES, W_CORE_TENS,
-    W_CORE_ONES_MIRROR, W_DIGIT_WHEEL_GEAR, TOL_MOVING,
+    W_CORE_ONES_MIRROR, W_CORE_MIDDLE, W_DIGIT_WHEEL_GEAR, TOL_MOVING,
     X_PEG_CORE_CENTER, Y_PEG_CORE_CENTER, THETA_PEG_CORE_CENTER
 )
 from scorecounter.geometry import _compute_closest_point_on_circle
@@ -31,10 +32,12 @@ def make_core_ones() -> cq.Workplane:
     return core_ones
 
 
-def make_core_tens() -> cq.Workplane:
+def make_core_tens(W_core: Optional[int | float] = None) -> cq.Workplane:
+    if W_core is None:
+        W_core = W_CORE_TENS
     # Goes into the ones ring
     W_thinner = 2 * W_DIGIT_WHEEL_GEAR + 2 * TOL_MOVING
-    W_thicker = W_CORE_TENS - W_thinner
+    W_thicker = W_core - W_thinner
     core_tens = make_core_bottom(W_thicker, W_thinner,
                                  orientation_top='Thinner')
     core_tens = make_core_shaft_from_bottom(core_tens, W_thicker + W_thinner)
@@ -42,14 +45,39 @@ def make_core_tens() -> cq.Workplane:
     return core_tens
 
 
-def make_core_ones_mirror() -> cq.Workplane:
+def make_core_middle() -> cq.Workplane:
+    '''Makes the core of a middle wheel, which holds the carry gear into it
+    like the tens and receives the next carry gear like the ones.
+    '''
+    W_thinner = 2 * W_DIGIT_WHEEL_GEAR + 2 * TOL_MOVING
+    W_thicker = W_CORE_MIDDLE - W_thinner
+    core_middle = make_core_bottom(W_thicker, W_thinner,
+                                   orientation_top='Thinner')
+    core_middle = make_core_shaft_from_bottom(core_middle,
+                                              W_thicker + W_thinner)
+    core_middle = make_core_carry(core_middle, W_thicker, W_thinner)
+    core_middle = make_core_carry_recv(core_middle, W_thicker, W_thinner)
+    return core_middle
+
+
+def make_core_ones_mirror(carry: bool = False) -> cq.Workplane:
+    '''Makes the core of the mirrored ones.
+
+    If @carry is True, the mirrored ones wheel carries into the next mirrored
+    wheel, whose core extends into it.
+    '''
     W_thinner = W_DIGIT_WHEEL_GEAR + 2 * TOL_MOVING
     W_thicker = W_CORE_ONES_MIRROR - W_thinner
+    if carry:
+        W_thicker -= W_DIGIT_WHEEL_GEAR
     core_ones_mirror = make_core_bottom(W_thicker, W_thinner,
                                         orientation_top='Thinner',
                                         peg_top='Female')
     core_ones_mirror = make_core_shaft_gear(core_ones_mirror,
                                             W_thicker, W_thinner)
+    if carry:
+        core_ones_mirror = make_core_carry_recv(core_ones_mirror,
+                                                W_thicker, W_thinner)
     return core_ones_mirror
 
 
@@ -79,7 +107,7 @@ def make_core_bottom(W_thicker: int | float, W_thinner: int | float,
                       * math.tan(ANGLE_OVERHANG))
         W_thicker_actual -= W_overhang
 
-    core_bottom = (cq.Workplane()
+    core_bottom = (lean.Workplane()
                    .tag('bottom')
                    .circle(R_CORE_OUTER)
                    .circle(R_CORE_INNER)
@@ -328,18 +356,23 @@ def __make_cone(R_cone: int | float, angle_cone: int | float) -> cq.Workplane:
 if __name__ == '__cq_main__':
     import os
     from scorecounter.parameters import DIR_EXPORT, W_PEG
-    from cadquery import exporters
+    from inserts import export, threemf
 
     core_ones = make_core_ones()
-    exporters.export(core_ones, os.path.join(DIR_EXPORT, 'core_ones.stl'))
+    export.export(core_ones, os.path.join(DIR_EXPORT, 'core_ones.stl'))
 
     core_tens = make_core_tens()
-    exporters.export(core_tens, os.path.join(DIR_EXPORT, 'core_tens.stl'))
+    export.export(core_tens, os.path.join(DIR_EXPORT, 'core_tens.stl'))
 
     core_ones_mirror = make_core_ones_mirror()
-    exporters.export(core_ones_mirror,
-                     os.path.join(DIR_EXPORT, 'core_ones_mirror.stl'))
-
-    peg_standalone = make_peg_standalone(2 * W_PEG)
-    exporters.export(peg_standalone,
-                     os.path.join(DIR_EXPORT, 'peg_standalone.stl'))
+    export.export(core_ones_mirror,
+                  os.path.join(DIR_EXPORT, 'core_ones_mirror.stl'))
+
+    # Pegs join cores in mirrored pairs, printed from a single mesh.
+    peg_standalone = make_peg_standalone(2 * W_PEG).val()
+    W_print_gap = 5
+    pegs = threemf.Model()
+    for i in range(2):
+        loc = cq.Location(cq.Vector(i * (2 * R_PEG + W_print_gap), 0, 0))
+        pegs.add(peg_standalone.moved(loc), f'peg {i + 1}')
+    export.export(pegs, os.path.join(DIR_EXPORT, 'pegs.3mf'))
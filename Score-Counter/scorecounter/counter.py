@@ -0,0 +1,198 @@
+"""Score counters of any number of digits.
+
+The two digit counter generalizes from the bump side to the opposite case:
+
+  ones, middle (N - 2), tens, mirrored wheels (N - 1)
+
+Every wheel carries into the next one up to the tens (the top digit), whose
+wheel shows its digit on both sides. The mirrored wheels read the same
+number on the other side: the mirrored ones is turned by the shaft and
+carries into the next mirrored wheel, down to the one next to the tens. For
+N = 2 this is the ones, tens and mirrored ones wheels and cores.
+
+Wheels and cores are built once per kind and placed by reference.
+"""
+
+import functools
+import cadquery as cq
+from typing import Callable, Dict, List, Optional, Tuple
+from scorecounter.case import make_case_opposite, make_digit_cover
+from scorecounter.core import (
+    make_core_middle, make_core_ones, make_core_ones_mirror, make_core_tens
+)
+from scorecounter.digitwheel import (
+    make_wheel_middle, make_wheel_ones, make_wheel_ones_mirror,
+    make_wheel_tens
+)
+from scorecounter.gear import make_carry_gear, make_shaft, make_shaft_gear
+from scorecounter.parameters import (
+    N_DIGITS, RG_DIGIT, SG_SHAFT, T_CASE_CORE_WALL, TOL_MOVING,
+    TOL_TIGHT_FIT, W_CARRY_GEAR, W_CORE_MIDDLE, W_CORE_ONES,
+    W_CORE_ONES_MIRROR, W_CORE_TENS, W_DIGIT_CHARACTER, W_DIGIT_SPACING,
+    W_DIGIT_WHEEL_BUMP, W_DIGIT_WHEEL_GEAR, W_WHEEL_MIDDLE, W_WHEEL_ONES,
+    W_WHEEL_ONES_MIRROR, W_WHEEL_TENS
+)
+
+W_DIGIT_AREA = W_DIGIT_CHARACTER + W_DIGIT_SPACING
+
+# Wheels by kind: builder, width and the Z of the digit on the bump side and
+# on the mirrored side (None if not shown on that side).
+WHEELS: Dict[str, Tuple[Callable[[], cq.Workplane], float,
+                        Optional[float], Optional[float]]] = {
+    'wheel_ones': (make_wheel_ones, W_WHEEL_ONES,
+                   W_DIGIT_WHEEL_BUMP + W_DIGIT_AREA / 2, None),
+    'wheel_middle': (make_wheel_middle, W_WHEEL_MIDDLE,
+                     W_WHEEL_MIDDLE / 2, None),
+    'wheel_tens': (make_wheel_tens, W_WHEEL_TENS,
+                   W_DIGIT_AREA / 2, W_WHEEL_TENS - W_DIGIT_AREA / 2),
+    'wheel_ones_mirror': (make_wheel_ones_mirror, W_WHEEL_ONES_MIRROR,
+                          None, W_WHEEL_ONES_MIRROR / 2),
+    'wheel_ones_mirror_carry': (
+        functools.partial(make_wheel_ones_mirror, carry=True),
+        W_WHEEL_ONES_MIRROR, None, W_WHEEL_ONES_MIRROR / 2),
+}
+
+# Cores by kind: builder and width.
+CORES: Dict[str, Tuple[Callable[[], cq.Workplane], float]] = {
+    'core_ones': (make_core_ones, W_CORE_ONES),
+    'core_middle': (make_core_middle, W_CORE_MIDDLE),
+    'core_tens': (make_core_tens, W_CORE_TENS),
+    # Core of the mirrored wheel next to the tens, driven by a carry gear.
+    'core_tens_mirror': (
+        functools.partial(make_core_tens,
+                          W_CORE_ONES_MIRROR + W_DIGIT_WHEEL_GEAR),
+        W_CORE_ONES_MIRROR + W_DIGIT_WHEEL_GEAR),
+    'core_ones_mirror': (make_core_ones_mirror, W_CORE_ONES_MIRROR),
+    'core_ones_mirror_carry': (
+        functools.partial(make_core_ones_mirror, carry=True),
+        W_CORE_ONES_MIRROR - W_DIGIT_WHEEL_GEAR),
+}
+
+
+def make_layout(N: int) -> List[Tuple[str, str, bool]]:
+    '''Returns the wheel, core and whether it faces the bump side for every
+    position, from the bump side.
+    '''
+    if N < 2:
+        raise ValueError(f'A counter has at least two digits, not {N}')
+    layout = [('wheel_ones', 'core_ones', True)]
+    layout += [('wheel_middle', 'core_middle', True)] * (N - 2)
+    layout += [('wheel_tens', 'core_tens', True)]
+    if N == 2:
+        return layout + [('wheel_ones_mirror', 'core_ones_mirror', False)]
+
+    # Mirrored cores face the opposite case, so the middle ones are the same
+    # solids as on the bump side, turned over.
+    layout += [('wheel_ones_mirror', 'core_tens_mirror', False)]
+    layout += [('wheel_ones_mirror_carry', 'core_middle', False)] * (N - 3)
+    layout += [('wheel_ones_mirror_carry', 'core_ones_mirror_carry', False)]
+    return layout
+
+
+def compute_shaft_width(N: int) -> float:
+    return sum(CORES[core][1] for _, core, _ in make_layout(N))
+
+
+def compute_case_inner_width(N: int) -> float:
+    return compute_shaft_width(N) + 2 * TOL_TIGHT_FIT
+
+
+def compute_digit_windows(N: int) -> Tuple[float, float, float]:
+    '''Returns the Z of the digit windows on the bump side and on the
+    mirrored side, measured from the outside of the opposite case, and their
+    width.
+    '''
+    Z_bump_digits, Z_mirror_digits = list(), list()
+    Z = 0
+    for wheel, _, _ in make_layout(N):
+        _, W, Z_bump_digit, Z_mirror_digit = WHEELS[wheel]
+        if Z_bump_digit is not None:
+            Z_bump_digits.append(Z + Z_bump_digit)
+        if Z_mirror_digit is not None:
+            Z_mirror_digits.append(Z + Z_mirror_digit)
+        Z += W + 2 * TOL_MOVING
+    # Z is now past the last wheel, and its gap, from the bump side.
+    Z_outside = Z - TOL_MOVING + T_CASE_CORE_WALL
+
+    # Windows are offset by TOL_MOVING toward the opposite case, as in the
+    # two digit cover.
+    def center(Z_digits: List[float]) -> float:
+        return Z_outside - (min(Z_digits) + max(Z_digits)) / 2 - TOL_MOVING
+
+    W_digits = N * W_DIGIT_AREA + 2 * (N - 1) * TOL_MOVING
+    return center(Z_bump_digits), center(Z_mirror_digits), W_digits
+
+
+@functools.cache
+def make_part(name: str) -> cq.Workplane:
+    '''Makes a wheel or core once, to be shared by every counter.'''
+    if name in WHEELS:
+        return WHEELS[name][0]()
+    return CORES[name][0]()
+
+
+def make_parts(N: int) -> Dict[str, Tuple[cq.Workplane, int]]:
+    '''Returns every part to print for an N digit counter and its count.
+
+    The cases and cover whose size does not depend on N are left out.
+    '''
+    counts: Dict[str, int] = dict()
+    for wheel, core, _ in make_layout(N):
+        counts[wheel] = counts.get(wheel, 0) + 1
+        counts[core] = counts.get(core, 0) + 1
+    parts = {name: (make_part(name), count) for name, count in counts.items()}
+
+    Z_bump, Z_mirror, W_digits = compute_digit_windows(N)
+    parts['shaft'] = (make_shaft(compute_shaft_width(N)), 1)
+    parts['gear_shaft'] = (make_shaft_gear(W_DIGIT_WHEEL_GEAR), 2)
+    # One per wheel carried into, on either side.
+    parts['gear_carry'] = (make_carry_gear(W_CARRY_GEAR), 2 * N - 3)
+    parts['case_opposite'] = (make_case_opposite(compute_case_inner_width(N)),
+                              1)
+    parts['digit_cover'] = (make_digit_cover(compute_case_inner_width(N),
+                                             Z_bump, Z_mirror, W_digits), 1)
+    return parts
+
+
+def make_counter(N: int) -> cq.Assembly:
+    '''Assembles the wheels, cores and shaft of an N digit counter.
+
+    Z runs from the bump side to the opposite case. Identical wheels and
+    cores are the same objects, placed at several locations.
+    '''
+    counter = cq.Assembly(name=f'counter_{N}')
+    Z_wheel = 0
+    Z_core = -TOL_MOVING
+    for i, (wheel, core, bump_side) in enumerate(make_layout(N)):
+        W_wheel = WHEELS[wheel][1]
+        W_core = CORES[core][1]
+        # Wheels on the bump side face the opposite case, mirrored wheels are
+        # centered and face the bump side. Cores face the wheels they drive.
+        if bump_side:
+            loc_wheel = cq.Location(cq.Vector(0, 0, Z_wheel))
+            loc_core = cq.Location(cq.Vector(0, 0, Z_core + W_core),
+                                   cq.Vector(1, 0, 0), 180)
+        else:
+            loc_wheel = cq.Location(cq.Vector(0, 0, Z_wheel + W_wheel / 2))
+            loc_core = cq.Location(cq.Vector(0, 0, Z_core))
+        counter.add(make_part(wheel), name=f'{i}_{wheel}', loc=loc_wheel)
+        counter.add(make_part(core), name=f'{i}_{core}', loc=loc_core)
+        Z_wheel += W_wheel + 2 * TOL_MOVING
+        Z_core += W_core
+
+    x_shaft_center = -(RG_DIGIT.r0 - SG_SHAFT.r0)
+    counter.add(make_shaft(compute_shaft_width(N)), name='shaft',
+                loc=cq.Location(cq.Vector(x_shaft_center, 0, -TOL_MOVING)))
+    return counter
+
+
+if __name__ == '__cq_main__':
+    import os
+    from inserts import export
+    from scorecounter.parameters import DIR_EXPORT
+
+    # Apart from the parts the other modules export for two digits.
+    dir_counter = os.path.join(DIR_EXPORT, f'counter_{N_DIGITS}')
+    for name, (part, count) in make_parts(N_DIGITS).items():
+        print(f'{name}: {count}')
+        export.export(part, os.path.join(dir_counter, f'{name}.stl'))
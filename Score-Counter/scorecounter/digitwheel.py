@@ -1,12 +1,13 @@
 import functools
 import math
 import cadquery as cq
-from cq_gears import RingGear
+from scorecounter.gear import make_gear
 from scorecounter.parameters import (
     GEAR_MODULE, N_TEETH_DIGIT, W_DIGIT_WHEEL_GEAR, T_DIGIT_WHEEL_RIM,
     ANGLE_OVERHANG, R_DIGIT_WHEEL_OUTER, R_DIGIT_WHEEL_INNER, RG_DIGIT,
     W_CARRY_GEAR_MUTILATED, DIGITS, FONT, W_DIGIT_CHARACTER, T_FONT,
     W_WHEEL_ONES, W_WHEEL_TENS, W_WHEEL_ONES_MIRROR, W_DIGIT_WHEEL_BUMP,
+    W_WHEEL_MIDDLE,
     ANGLE_BUMP_ALL, ANGLE_BUMP, R_BUMP_OUTER, W_DIGIT_SPACING, ANGLE_VIEWING
 )
 from typing import Literal, Optional, Tuple
@@ -86,8 +87,39 @@ def make_wheel_tens() -> cq.Workplane:
     return wheel_tens
 
 
-def make_wheel_ones_mirror() -> cq.Workplane:
+def make_wheel_middle() -> cq.Workplane:
+    '''Makes a wheel between the ones and the top digit, which is driven
+    like the tens and carries like the ones.
+    '''
+    W_wheel_middle_inner = W_WHEEL_MIDDLE - 2 * W_DIGIT_WHEEL_GEAR
+    digit_middle = (make_digit_tool(R_DIGIT_WHEEL_OUTER, T_FONT,
+                                    low_to_high='RotateUp')
+                    .rotate((0, 0, 0), (0, 0, 1),
+                            -(math.degrees(ANGLE_VIEWING)
+                              + (1 - 1/2) * 360 / len(DIGITS)))
+                    .translate((0, 0, W_WHEEL_MIDDLE / 2))
+                    )
+    wheel_middle = (make_digit_wheel_rgear(W_DIGIT_WHEEL_GEAR)
+                    .union(
+                        make_digit_wheel_inner(W_wheel_middle_inner)
+                        .translate((0, 0, W_DIGIT_WHEEL_GEAR)))
+                    .union(
+                        make_digit_wheel_carry()
+                        .translate((0, 0,
+                                    W_WHEEL_MIDDLE - W_DIGIT_WHEEL_GEAR)))
+                    .cut(digit_middle)
+                    )
+    return wheel_middle
+
+
+def make_wheel_ones_mirror(carry: bool = False) -> cq.Workplane:
+    '''Makes a mirrored wheel, centered on Z and facing down.
+
+    If @carry is True, the wheel carries into the next mirrored wheel.
+    '''
     W_wheel_ones_mirror_inner = W_WHEEL_ONES_MIRROR - W_DIGIT_WHEEL_GEAR
+    if carry:
+        W_wheel_ones_mirror_inner -= W_DIGIT_WHEEL_GEAR
     digit_ones_mirror = (make_digit_tool(R_DIGIT_WHEEL_OUTER, T_FONT,
                                          low_to_high='RotateDown')
                          .rotate((0, 0, 0), (0, 0, 1),
@@ -99,6 +131,15 @@ def make_wheel_ones_mirror() -> cq.Workplane:
                          .union(
                              make_digit_wheel_inner(W_wheel_ones_mirror_inner)
                              .translate((0, 0, W_DIGIT_WHEEL_GEAR)))
+                         )
+    if carry:
+        wheel_ones_mirror = (wheel_ones_mirror
+                             .union(
+                                 make_digit_wheel_carry()
+                                 .translate((0, 0, W_WHEEL_ONES_MIRROR
+                                             - W_DIGIT_WHEEL_GEAR)))
+                             )
+    wheel_ones_mirror = (wheel_ones_mirror
                          .cut(digit_ones_mirror)
                          .translate((0, 0, -W_WHEEL_ONES_MIRROR / 2))
                          .rotate((0, 0, 0), (1, 0, 0), 180)
@@ -109,10 +150,8 @@ def make_wheel_ones_mirror() -> cq.Workplane:
 def make_digit_wheel_rgear(width: Optional[int | float] = None) -> cq.Workplane:
     if width is None:
         width = W_DIGIT_WHEEL_GEAR
-    rg_digit = RingGear(module=GEAR_MODULE, teeth_number=N_TEETH_DIGIT,
-                        width=width, rim_width=T_DIGIT_WHEEL_RIM)
-    digit_gear: cq.Workplane = cq.Workplane().gear(rg_digit)
-    return digit_gear
+    return make_gear(GEAR_MODULE, N_TEETH_DIGIT, width,
+                     rim_width=T_DIGIT_WHEEL_RIM)
 
 
 def make_digit_wheel_inner(width: int | float,
@@ -192,30 +231,43 @@ def make_digit_tool(R_width_outer: int | float, T_width_rim: int | float, *,
       a) RotateUp: thumb pushes upwards.
       b) RotateDown: thumb pushes downwards.
     '''
-    ring = (cq.Workplane()
-            .circle(R_width_outer)
-            .circle(R_width_outer - T_width_rim)
-            .extrude(W_DIGIT_CHARACTER / 2, both=True)
-            )
-
-    digit_tool = cq.Workplane()
-
-    font_size = __get_font_size()
     angle_digit = 360 / len(DIGITS)
     if low_to_high == 'RotateUp':
         angle_digit *= -1
-    for i, digit in enumerate(DIGITS):
-        dx, dy = __get_digit_center_adj(digit, font_size)
-        wp = (cq.Workplane()
-              .text(digit, fontsize=font_size, distance=R_width_outer,
-                    font=FONT)
-              .translate((dx, dy, 0))
-              .rotate((0, 0, 0), (0, 1, 0), 90)
-              .rotate((0, 0, 0), (0, 0, 1), angle_digit * i)
-              )
-        digit_tool = digit_tool.union(wp
-                                      .intersect(ring))
-    return digit_tool
+    # Both orders are the same digits, placed in opposite directions.
+    digits = [__make_digit(digit, R_width_outer, T_width_rim)
+              .moved(cq.Location(cq.Vector(), cq.Vector(0, 0, 1),
+                                 angle_digit * i))
+              for i, digit in enumerate(DIGITS)]
+    return cq.Workplane(obj=cq.Compound.makeCompound(digits))
+
+
+@functools.cache
+def __make_digit(digit: str, R_width_outer: int | float,
+                 T_width_rim: int | float) -> cq.Shape:
+    '''Makes the tool of a single digit, facing the X axis.
+
+    The digit is extruded only through the rim, from just below the inner
+    radius at its edges, and trimmed to the inner radius.
+    '''
+    R_width_inner = R_width_outer - T_width_rim
+    font_size = __get_font_size()
+    dx, dy = __get_digit_center_adj(digit, font_size)
+    H_half = __get_digit_half_height(digit, font_size)
+    X_start = math.sqrt(R_width_inner ** 2 - H_half ** 2) - T_width_rim
+
+    inner = (cq.Workplane()
+             .circle(R_width_inner)
+             .extrude(W_DIGIT_CHARACTER, both=True)
+             )
+    digit_tool = (cq.Workplane()
+                  .text(digit, fontsize=font_size,
+                        distance=R_width_outer - X_start, font=FONT)
+                  .translate((dx, dy, X_start))
+                  .rotate((0, 0, 0), (0, 1, 0), 90)
+                  .cut(inner)
+                  )
+    return digit_tool.val()
 
 
 def __make_two_carry_teeth(width: int | float) -> cq.Workplane:
@@ -302,17 +354,27 @@ def __get_digit_center_adj(digit: str, font_size: int | float
     return -bb_c.x, -bb_c.y
 
 
+@functools.cache
+def __get_digit_half_height(digit: str, font_size: int | float) -> float:
+    '''Returns half the height of a digit.'''
+
+    txt = cq.Workplane().text(digit, fontsize=font_size, distance=1,
+                              font=FONT)
+    assert len(txt.objects) == 1
+    return txt.objects[0].BoundingBox().ylen / 2
+
+
 if __name__ == '__cq_main__':
     import os
     from scorecounter.parameters import DIR_EXPORT
-    from cadquery import exporters
+    from inserts import export
 
     wheel_ones = make_wheel_ones()
-    exporters.export(wheel_ones, os.path.join(DIR_EXPORT, 'wheel_ones.stl'))
+    export.export(wheel_ones, os.path.join(DIR_EXPORT, 'wheel_ones.stl'))
 
     wheel_tens = make_wheel_tens()
-    exporters.export(wheel_tens, os.path.join(DIR_EXPORT, 'wheel_tens.stl'))
+    export.export(wheel_tens, os.path.join(DIR_EXPORT, 'wheel_tens.stl'))
 
     wheel_ones_mirror = make_wheel_ones_mirror()
-    exporters.export(wheel_ones_mirror,
-                     os.path.join(DIR_EXPORT, 'wheel_ones_mirror.stl'))
+    export.export(wheel_ones_mirror,
+                  os.path.join(DIR_EXPORT, 'wheel_ones_mirror.stl'))
@@ -1,18 +1,45 @@
+import functools
 import math
 import cadquery as cq
 from typing import Optional
-from cq_gears import SpurGear
+from cq_gears import RingGear, SpurGear
 from scorecounter.parameters import (
     GEAR_MODULE, N_TEETH_CARRY, N_TEETH_SHAFT, W_CARRY_GEAR_MUTILATED,
     W_SHAFT_SQUARE, TOL_TIGHT_FIT, W_SHAFT, R_SHAFT, ANGLE_OVERHANG,
-    W_DIGIT_WHEEL_GEAR, R_PEG_CARRY, TOL_MOVING
+    W_DIGIT_WHEEL_GEAR, R_PEG_CARRY, TOL_MOVING, SG_CARRY
 )
 
 
+def make_gear(module: int | float, teeth_number: int, width: int | float,
+              rim_width: Optional[int | float] = None) -> cq.Workplane:
+    '''Makes a spur gear, or a ring gear if @rim_width is given.
+
+    The cross-section is computed once per gear and extruded to @width.
+    '''
+    profile = make_gear_profile(module, teeth_number, rim_width)
+    return cq.Workplane(obj=cq.Solid.extrudeLinear(profile,
+                                                   cq.Vector(0, 0, width)))
+
+
+@functools.cache
+def make_gear_profile(module: int | float, teeth_number: int,
+                      rim_width: Optional[int | float] = None) -> cq.Face:
+    '''Makes the cross-section of a spur gear, or of a ring gear if
+    @rim_width is given.
+
+    The gear is built by cq_gears, once, and its bottom face is returned.
+    Gears without a helix have the same section at every height.
+    '''
+    if rim_width is None:
+        gear = SpurGear(module=module, teeth_number=teeth_number, width=1)
+    else:
+        gear = RingGear(module=module, teeth_number=teeth_number, width=1,
+                        rim_width=rim_width)
+    return cq.Workplane().gear(gear).faces('<Z').val()
+
+
 def make_shaft_gear(width: int | float) -> cq.Workplane:
-    sg_shaft = SpurGear(module=GEAR_MODULE, teeth_number=N_TEETH_SHAFT,
-                        width=width)
-    shaft_gear: cq.Workplane = cq.Workplane().gear(sg_shaft)
+    shaft_gear = make_gear(GEAR_MODULE, N_TEETH_SHAFT, width)
     shaft_gear = (shaft_gear
                   .moveTo(0, 0)
                   .rect(W_SHAFT_SQUARE + TOL_TIGHT_FIT,
@@ -27,9 +54,8 @@ def make_carry_gear(width: int | float,
                     ) -> cq.Workplane:
     if mutilated_width is None:
         mutilated_width = W_CARRY_GEAR_MUTILATED
-    sg_carry = SpurGear(module=GEAR_MODULE, teeth_number=N_TEETH_CARRY,
-                        width=width)
-    carry_gear: cq.Workplane = cq.Workplane().gear(sg_carry)
+    sg_carry = SG_CARRY
+    carry_gear = make_gear(GEAR_MODULE, N_TEETH_CARRY, width)
 
     cut_tool = (cq.Workplane()
                 .moveTo(sg_carry.rd * math.cos(sg_carry.tau / 2),
@@ -59,7 +85,9 @@ def make_carry_gear(width: int | float,
     return carry_gear
 
 
-def make_shaft() -> cq.Workplane:
+def make_shaft(width: Optional[int | float] = None) -> cq.Workplane:
+    if width is None:
+        width = W_SHAFT
     W_overhang = (R_SHAFT - W_SHAFT_SQUARE / 2) * math.tan(ANGLE_OVERHANG)
     shaft = (cq.Workplane()
              # Create gear square connector.
@@ -76,7 +104,7 @@ def make_shaft() -> cq.Workplane:
              .faces('>Z')
              .workplane()
              .circle(R_SHAFT)
-             .extrude(W_SHAFT - 2 * (W_DIGIT_WHEEL_GEAR + W_overhang))
+             .extrude(width - 2 * (W_DIGIT_WHEEL_GEAR + W_overhang))
              # Create printer-friendly loft (mirrored).
              .faces('>Z')
              .wires()
@@ -96,13 +124,13 @@ def make_shaft() -> cq.Workplane:
 if __name__ == '__cq_main__':
     import os
     from scorecounter.parameters import DIR_EXPORT
-    from cadquery import exporters
+    from inserts import export
 
     gear_shaft = make_shaft_gear(W_DIGIT_WHEEL_GEAR)
-    exporters.export(gear_shaft, os.path.join(DIR_EXPORT, 'gear_shaft.stl'))
+    export.export(gear_shaft, os.path.join(DIR_EXPORT, 'gear_shaft.stl'))
 
     shaft = make_shaft()
-    exporters.export(shaft, os.path.join(DIR_EXPORT, 'shaft.stl'))
+    export.export(shaft, os.path.join(DIR_EXPORT, 'shaft.stl'))
 
     gear_carry = make_carry_gear(2 * W_DIGIT_WHEEL_GEAR)
-    exporters.export(gear_carry, os.path.join(DIR_EXPORT, 'gear_carry.stl'))
+    export.export(gear_carry, os.path.join(DIR_EXPORT, 'gear_carry.stl'))
@@ -0,0 +1,164 @@
+"""Meshes of the carry and shaft gears in the digit ring gear.
+
+The carry gear (SG_CARRY) and the shaft gear (SG_SHAFT) both run inside the
+ring gear of the digit wheels (RG_DIGIT), at the standard center distance and
+with unshifted teeth as built by cq_gears. For every mesh this computes, from
+the formulas of internal gear pairs and without building any solid:
+
+- the contact ratio, which should stay above 1 for the teeth to hand over,
+- the backlash given by the play TOL_MOVING of the gear on its peg,
+- the root clearance left once the mesh closes by TOL_MOVING,
+- the involute and trochoid interference margins, negative when the tips of
+  the ring gear dig into the pinion (the latter as it leaves the mesh,
+  common with few teeth of difference),
+- the undercut, the profile shift (in modules) that the pinion would need
+  to be generated without undercut, positive at risk.
+
+Everything is computed with numpy and broadcasts over arrays of modules and
+tooth counts:
+
+    R = np.linspace(15, 19, 9)[:, np.newaxis]
+    N_carry = np.arange(5, 10)
+    mesh = gearmesh.compute_mesh(gearmesh.compute_module(R), 20, N_carry)
+    print(mesh.feasible)
+"""
+
+import math
+import numpy as np
+from cq_gears import RingGear, SpurGear
+from dataclasses import dataclass
+from typing import Dict, Union
+from scorecounter.parameters import (
+    GEAR_MODULE, N_TEETH_CARRY, N_TEETH_DIGIT, N_TEETH_SHAFT,
+    T_DIGIT_WHEEL_RIM, TOL_MOVING
+)
+
+ArrayLike = Union[float, np.ndarray]
+
+PRESSURE_ANGLE = math.radians(20)  # Default of cq_gears.
+CONTACT_RATIO_MIN = 1.1
+
+
+@dataclass(frozen=True)
+class MeshAnalysis:
+    contact_ratio: np.ndarray
+    backlash: np.ndarray  # Along the pitch circle.
+    clearance: np.ndarray  # Radial, between tips and roots.
+    involute_interference: np.ndarray  # Margin in mm of ring gear radius.
+    trochoid_interference: np.ndarray  # Margin in rad.
+    undercut: np.ndarray  # Profile shift needed, in modules.
+
+    @property
+    def feasible(self) -> np.ndarray:
+        return ((self.contact_ratio >= CONTACT_RATIO_MIN)
+                & (self.clearance >= 0)
+                & (self.involute_interference >= 0)
+                & (self.trochoid_interference >= 0))
+
+
+def compute_module(R_digit_wheel_outer: ArrayLike,
+                   N_teeth_digit: ArrayLike = N_TEETH_DIGIT) -> np.ndarray:
+    '''Module of the gears of a digit wheel of radius @R_digit_wheel_outer,
+    as derived in parameters.py.
+    '''
+    D_dedendum = 2 * np.asarray(R_digit_wheel_outer) - 2 * T_DIGIT_WHEEL_RIM
+    return D_dedendum / (np.asarray(N_teeth_digit) + 2 * RingGear.kd)
+
+
+def compute_mesh(module: ArrayLike, N_teeth_ring: ArrayLike,
+                 N_teeth_pinion: ArrayLike,
+                 tol: float = TOL_MOVING) -> MeshAnalysis:
+    '''Analyzes a spur gear of @N_teeth_pinion running in a ring gear of
+    @N_teeth_ring, both of @module, with @tol of play at their center.
+    '''
+    m, z2, z1 = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                      for a in (module, N_teeth_ring,
+                                                N_teeth_pinion)))
+    alpha = PRESSURE_ANGLE
+    r1, r2 = m * z1 / 2, m * z2 / 2
+    rb1, rb2 = r1 * math.cos(alpha), r2 * math.cos(alpha)
+    ra1 = r1 + SpurGear.ka * m
+    rd1 = r1 - SpurGear.kd * m
+    ra2 = r2 - RingGear.ka * m
+    rd2 = r2 + RingGear.kd * m
+    a = r2 - r1
+
+    # Points of the line of action from where it touches the base circle of
+    # the ring gear. Contact starts at the tip of the ring gear, but not
+    # before the point where the line touches the base circle of the pinion
+    # nor on the part of the ring's teeth inside its base circle, and ends at
+    # the tip of the pinion.
+    s_pinion_base = a * math.sin(alpha)
+    s_ring_tip = np.sqrt(np.maximum(ra2 ** 2 - rb2 ** 2, 0))
+    s_pinion_tip = s_pinion_base + np.sqrt(ra1 ** 2 - rb1 ** 2)
+    contact_ratio = ((s_pinion_tip - np.maximum(s_ring_tip, s_pinion_base))
+                     / (math.pi * m * math.cos(alpha)))
+
+    # The tips of the ring gear must not reach inside the point where the
+    # line of action touches the base circle of the pinion.
+    involute_interference = ra2 - np.hypot(rb2, s_pinion_base)
+
+    # Angles of the point where the tip circles cross, from both centers,
+    # taking the ring's tips at most down to its base circle.
+    ra2_involute = np.maximum(ra2, rb2)
+    alpha_a1 = np.arccos(rb1 / ra1)
+    alpha_a2 = np.arccos(rb2 / ra2_involute)
+    theta1 = (np.arccos(np.clip((ra2_involute ** 2 - ra1 ** 2 - a ** 2)
+                                / (2 * a * ra1), -1, 1))
+              + _involute(alpha_a1) - _involute(alpha))
+    theta2 = np.arccos(np.clip((a ** 2 + ra2_involute ** 2 - ra1 ** 2)
+                               / (2 * a * ra2_involute), -1, 1))
+    trochoid_interference = (theta1 * z1 / z2 + _involute(alpha)
+                             - _involute(alpha_a2) - theta2)
+
+    clearance = np.minimum(rd2 - (a + ra1), ra2 - (a + rd1)) - tol
+    undercut = SpurGear.ka - z1 * math.sin(alpha) ** 2 / 2
+    return MeshAnalysis(
+        contact_ratio=contact_ratio,
+        backlash=2 * tol * math.tan(alpha) * np.ones_like(m),
+        clearance=clearance,
+        involute_interference=involute_interference,
+        trochoid_interference=trochoid_interference,
+        undercut=undercut)
+
+
+def compute_separation(module: ArrayLike, N_teeth_ring: ArrayLike,
+                       N_teeth_carry: ArrayLike,
+                       N_teeth_shaft: ArrayLike) -> np.ndarray:
+    '''Gap between the tips of the carry and shaft gears, which sit on
+    opposite sides of the ring gear (negative when they intersect).
+    '''
+    m = np.asarray(module, dtype=float)
+    r_ring = m * np.asarray(N_teeth_ring) / 2
+    r_carry = m * np.asarray(N_teeth_carry) / 2
+    r_shaft = m * np.asarray(N_teeth_shaft) / 2
+    return (2 * r_ring - 2 * r_carry - 2 * r_shaft
+            - 2 * SpurGear.ka * m)
+
+
+def analyze_digit_gears() -> Dict[str, MeshAnalysis]:
+    '''Analyzes the meshes of RG_DIGIT with SG_CARRY and SG_SHAFT.'''
+    return {
+        'carry': compute_mesh(GEAR_MODULE, N_TEETH_DIGIT, N_TEETH_CARRY),
+        'shaft': compute_mesh(GEAR_MODULE, N_TEETH_DIGIT, N_TEETH_SHAFT),
+    }
+
+
+def _involute(angle: ArrayLike) -> np.ndarray:
+    return np.tan(angle) - angle
+
+
+if __name__ == '__cq_main__':
+    for name, mesh in analyze_digit_gears().items():
+        print(f'{name}:')
+        print(f'  contact ratio: {float(mesh.contact_ratio):.2f}')
+        print(f'  backlash: {float(mesh.backlash):.3f}')
+        print(f'  clearance: {float(mesh.clearance):.3f}')
+        print(f'  involute interference: '
+              f'{float(mesh.involute_interference):.3f}')
+        print(f'  trochoid interference: '
+              f'{float(mesh.trochoid_interference):.4f}')
+        print(f'  undercut: {float(mesh.undercut):.2f}')
+    separation = compute_separation(GEAR_MODULE, N_TEETH_DIGIT,
+                                    N_TEETH_CARRY, N_TEETH_SHAFT)
+    print(f'Separation of carry and shaft gears: {float(separation):.3f}')
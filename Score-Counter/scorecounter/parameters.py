@@ -41,6 +41,9 @@ FONT = 'monaco'  # Digit font.
 # Core configuration.
 T_CORE_WALL = 1.8
 
+# Counter.
+N_DIGITS = 2  # Number of digits shown on each side.
+
 # General gear configuration.
 N_TEETH_DIGIT = 20  # Should be 2 x len(DIGITS).
 N_TEETH_CARRY = 6
@@ -116,6 +119,7 @@ W_WHEEL_ONES = W_DIGIT_CHARACTER + W_DIGIT_SPACING + W_DIGIT_WHEEL_BUMP
 W_WHEEL_TENS = (2 * W_DIGIT_CHARACTER + W_DIGIT_SPACING
                 + max(T_WALL_MIN, W_DIGIT_SPACING / 2))
 W_WHEEL_ONES_MIRROR = W_DIGIT_CHARACTER + W_DIGIT_SPACING
+W_WHEEL_MIDDLE = W_DIGIT_CHARACTER + W_DIGIT_SPACING
 
 # Core configuration.
 R_CORE_OUTER = R_DIGIT_WHEEL_INNER - TOL_MOVING
@@ -127,6 +131,7 @@ R_PEG_CORE = R_PEG + T_WALL_MIN + TOL_TIGHT_FIT
 W_CORE_ONES = W_WHEEL_ONES - W_DIGIT_WHEEL_GEAR + 2 * TOL_MOVING
 W_CORE_TENS = W_WHEEL_TENS + W_DIGIT_WHEEL_GEAR + 2 * TOL_MOVING
 W_CORE_ONES_MIRROR = W_WHEEL_ONES_MIRROR + 2 * TOL_MOVING
+W_CORE_MIDDLE = W_WHEEL_MIDDLE + 2 * TOL_MOVING
 
 
 # Compute center of peg s.t. its edge intersects with the inner wall
@@ -220,6 +225,7 @@ H_COVER_INTERFACE = 2 * T_WALL_MIN + 2 * TOL_TIGHT_FIT
 W_COVER_INTERFACE_WALL = T_WALL_MIN
 
 # Sanity checks.
+assert N_DIGITS >= 2
 assert N_TEETH_DIGIT % 2 == 0
 assert N_TEETH_CARRY % 2 == 0
 assert RG_DIGIT.rim_r == R_DIGIT_WHEEL_OUTER
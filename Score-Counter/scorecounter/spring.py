@@ -0,0 +1,174 @@
+"""Stiffness and strain of the detent spring of the case.
+
+Each half of the spring (see case.make_spring) is a curved cantilever: a
+circular arc of radius R_spring clamped where it leaves the slot and loaded
+at its bump, which the bumps of the digit wheel push outward by
+T_spring_bump along ANGLE_SPRING. The inner side of the arc is the outer side
+moved by T_spring along X, so the beam thins as it curves away from the slot.
+
+By Castigliano's theorem, the compliance of the beam along the load is the
+integral of m(s)^2 / (E I(s)) along the arc, where m(s) is the moment arm of
+a unit load. Only bending is counted, which holds for a beam this slender.
+Everything is computed with numpy and broadcasts over arrays of parameters:
+
+    T = np.linspace(0.4, 1.6, 1000)
+    response = spring.compute_spring(T, material='PETG')
+    print(response.F, response.strain)
+
+Forces are in N, lengths in mm and moduli in MPa.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple, Union
+from scorecounter.parameters import (
+    ANGLE_BUMP, ANGLE_BUMP_ALL, ANGLE_SPRING, R_BUMP_OUTER, R_SPRING,
+    T_SPRING, T_SPRING_BUMP, T_WALL_MIN, W_SPRING
+)
+
+ArrayLike = Union[float, np.ndarray]
+
+# Number of points along the arc integrated over.
+N_SAMPLES = 65
+# Detent force of each half of the spring that is felt but lets the wheel
+# turn easily.
+F_DETENT_MIN = 0.5
+F_DETENT_MAX = 3
+
+
+@dataclass(frozen=True)
+class Material:
+    E: float  # Young's modulus of printed parts.
+    strain_max: float  # Strain the spring may flex to, again and again.
+
+
+MATERIALS: Dict[str, Material] = {
+    'PLA': Material(3500, 0.015),
+    'PETG': Material(2100, 0.025),
+    'ABS': Material(2200, 0.02),
+    'ASA': Material(2000, 0.02),
+    'PA': Material(1500, 0.04),
+}
+
+
+@dataclass(frozen=True)
+class SpringResponse:
+    k: np.ndarray  # Stiffness of a half along the load.
+    F: np.ndarray  # Detent force of a half.
+    strain: np.ndarray  # Peak strain.
+    stress: np.ndarray  # Peak stress.
+
+
+def compute_spring(T_spring: ArrayLike = T_SPRING,
+                   R_spring: ArrayLike = R_SPRING,
+                   W_spring: ArrayLike = W_SPRING,
+                   T_spring_bump: ArrayLike = T_SPRING_BUMP,
+                   material: str = 'PLA') -> SpringResponse:
+    '''Computes the response of a half of the spring to the wheel bumps.
+
+    The geometry is derived from the parameters as in parameters.py.
+    '''
+    E = MATERIALS[material].E
+    T, R, W, D = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                       for a in (T_spring, R_spring, W_spring,
+                                                 T_spring_bump)))
+    X_bump, Y_bump, Y_tangent, X_center, Y_slot = _compute_geometry(R, D)
+
+    # Points of the arc by their angle from -X about its center, from the
+    # slot to the bump, on the half of the spring with Y > 0.
+    t = np.linspace(0, 1, N_SAMPLES)
+    angle_slot = np.arcsin(Y_slot / R)[..., np.newaxis]
+    angle_tangent = np.arcsin(np.abs(Y_tangent) / R)[..., np.newaxis]
+    angle = angle_slot + (angle_tangent - angle_slot) * t
+    R, T, W = R[..., np.newaxis], T[..., np.newaxis], W[..., np.newaxis]
+    x = X_center[..., np.newaxis] + T / 2 - R * np.cos(angle)
+    y = R * np.sin(angle)
+    T_normal = T * np.cos(angle)
+    I_section = W * T_normal ** 3 / 12
+
+    # Moment arm of a unit load at the center of the bump, along the
+    # outward direction of the wheel.
+    x_load, y_load = np.cos(ANGLE_SPRING), -np.sin(ANGLE_SPRING)
+    m = ((X_bump[..., np.newaxis] - x) * y_load
+         - (np.abs(Y_bump)[..., np.newaxis] - y) * x_load)
+
+    weights = np.full(N_SAMPLES, 1.0)
+    weights[[0, -1]] = 0.5
+    ds = R * (angle_tangent - angle_slot) / (N_SAMPLES - 1)
+    compliance = np.sum(m ** 2 / (E * I_section) * weights * ds, axis=-1)
+    k = 1 / compliance
+    F = k * D
+    stress = np.max(F[..., np.newaxis] * np.abs(m) * (T_normal / 2)
+                    / I_section,
+                    axis=-1)
+    return SpringResponse(k, F, stress / E, stress)
+
+
+def sweep_thickness(T_springs: Optional[Iterable[float]] = None,
+                    materials: Optional[Iterable[str]] = None,
+                    F_range: Tuple[float, float] = (F_DETENT_MIN,
+                                                    F_DETENT_MAX),
+                    **kwargs) -> Dict[str, Optional[Tuple[float, float]]]:
+    '''Returns the range of T_spring of every material whose detent force is
+    in @F_range without straining the spring beyond the material's limit.
+
+    @T_springs are the thicknesses tried, by default from T_WALL_MIN / 2 to
+    3 * T_WALL_MIN. Other parameters are passed to compute_spring. Materials
+    with no feasible thickness get None.
+    '''
+    if T_springs is None:
+        T_springs = np.linspace(T_WALL_MIN / 2, 3 * T_WALL_MIN, 1001)
+    if materials is None:
+        materials = MATERIALS.keys()
+    T_springs = np.asarray(list(T_springs), dtype=float)
+
+    ranges: Dict[str, Optional[Tuple[float, float]]] = dict()
+    for material in materials:
+        response = compute_spring(T_springs, material=material, **kwargs)
+        feasible = ((response.F >= F_range[0]) & (response.F <= F_range[1])
+                    & (response.strain <= MATERIALS[material].strain_max))
+        if feasible.ndim > 1:
+            raise ValueError('Only T_spring may be swept')
+        T_feasible = T_springs[feasible]
+        ranges[material] = ((float(T_feasible.min()), float(T_feasible.max()))
+                            if T_feasible.size else None)
+    return ranges
+
+
+def _compute_geometry(R_spring: np.ndarray, T_spring_bump: np.ndarray
+                      ) -> Tuple[np.ndarray, ...]:
+    '''Returns the center of the spring bump, the Y of its tangent with the
+    spring, the X of the center of the spring and the Y of the slot.
+    '''
+    X_bump_corner = R_BUMP_OUTER * np.cos(ANGLE_BUMP_ALL - ANGLE_BUMP)
+    Y_bump_corner = R_BUMP_OUTER * np.sin(ANGLE_BUMP_ALL - ANGLE_BUMP)
+    T_bump_corner = np.hypot(X_bump_corner - R_BUMP_OUTER, Y_bump_corner)
+    R_spring_bump = ((T_spring_bump ** 2 + T_bump_corner ** 2 / 4)
+                     / (2 * T_spring_bump))
+
+    angle_bump_space = ANGLE_BUMP_ALL - ANGLE_BUMP
+    X_bump_midpt = R_BUMP_OUTER * np.cos(angle_bump_space / 2) * np.cos(
+        ANGLE_SPRING)
+    Y_bump_midpt = R_BUMP_OUTER * np.cos(angle_bump_space / 2) * np.sin(
+        ANGLE_SPRING)
+    sagitta = R_spring_bump - T_spring_bump
+    X_bump = X_bump_midpt + sagitta * np.cos(ANGLE_SPRING)
+    Y_bump = Y_bump_midpt + sagitta * np.sin(ANGLE_SPRING)
+    X_tangent = X_bump + R_spring_bump * np.cos(ANGLE_SPRING)
+    Y_tangent = Y_bump + R_spring_bump * np.sin(ANGLE_SPRING)
+    X_center = X_tangent + np.sqrt(R_spring ** 2 - Y_tangent ** 2)
+    Y_slot = np.broadcast_to(T_bump_corner / 2, np.shape(R_spring))
+    return X_bump, Y_bump, Y_tangent, X_center, Y_slot
+
+
+if __name__ == '__cq_main__':
+    response = compute_spring()
+    print(f'Stiffness: {float(response.k):.2f} N/mm, '
+          f'detent force: {float(response.F):.2f} N, '
+          f'strain: {100 * float(response.strain):.2f}%')
+    for material, T_range in sweep_thickness().items():
+        if T_range is None:
+            print(f'{material}: no feasible T_SPRING')
+        else:
+            print(f'{material}: T_SPRING from {T_range[0]:.3f} '
+                  f'to {T_range[1]:.3f}')
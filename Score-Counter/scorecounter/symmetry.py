@@ -0,0 +1,46 @@
+"""Features built once and placed by symmetry.
+
+A symmetric feature is built as one half, or one of its copies, with its
+chamfers and fillets, then mirrored or rotated into place. The copies are
+returned as a single compound so that the feature is applied to a body in a
+single boolean:
+
+    case = case.cut(symmetry.mirrored(cover_tool_half, 'XZ'))
+"""
+
+import cadquery as cq
+from typing import Iterable, Literal, Tuple, Union
+
+Part = Union[cq.Workplane, cq.Shape]
+
+
+def placed(part: Part, locations: Iterable[cq.Location]) -> cq.Workplane:
+    '''Copies of @part moved to @locations, sharing its geometry.'''
+    shape = _shape(part)
+    return _compound([shape.moved(loc) for loc in locations])
+
+
+def rotated(part: Part, N: int,
+            axis: Tuple[float, float, float] = (0, 0, 1)) -> cq.Workplane:
+    '''@part and its N - 1 rotations about @axis, through the origin, by
+    multiples of 360 / N degrees.
+    '''
+    return placed(part, [cq.Location(cq.Vector(), cq.Vector(axis),
+                                     360 * i / N) for i in range(N)])
+
+
+def mirrored(part: Part, plane: Literal['XY', 'YZ', 'XZ'] = 'XZ'
+             ) -> cq.Workplane:
+    '''@part and its mirror image through @plane, through the origin.'''
+    shape = _shape(part)
+    return _compound([shape, shape.mirror(plane)])
+
+
+def _shape(part: Part) -> cq.Shape:
+    if isinstance(part, cq.Workplane):
+        return part.findSolid()
+    return part
+
+
+def _compound(shapes: Iterable[cq.Shape]) -> cq.Workplane:
+    return cq.Workplane(obj=cq.Compound.makeCompound(shapes))
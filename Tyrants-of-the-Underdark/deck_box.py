@@ -1,17 +1,20 @@
 import cadquery as cq
-from cadquery import exporters
+import functools
+
+from inserts import boxes, cardstack, catalog, export, parallel, plates
 
 tol_comfort = 0.3
 tol_tight_fit = 0.1
 T_wall = 0.8
 
-T_inner_40 = 25.5
-T_inner_30 = T_inner_40 / 40 * 30
-T_inner_28 = T_inner_40 / 40 * 28
-T_inner_15 = T_inner_40 / 40 * 15
-T_inner_12 = T_inner_40 / 40 * 12
-H_card = 92.25
-W_card = 66.5
+# Deck sizes (in cards) and the pairs of decks sharing a double box.
+DECK_SIZES = [40, 30, 28, 15, 12]
+DOUBLES = [(40, 30), (28, 12), (15, 15)]
+
+card = catalog.get('tyrants', 'sleeve', 'sleeved_card')
+T_inners = dict(zip(DECK_SIZES, cardstack.thicknesses(card, DECK_SIZES)))
+H_card = card.H
+W_card = card.W
 
 W_border = 4.5
 
@@ -22,10 +25,7 @@ W_inner = W_card + 2 * tol_comfort
 
 
 def make_box_inner(H_inner, W_inner, T_inner, T_wall, W_border, tol_tight_fit):
-    box_inner = (cq.Workplane()
-                 .box(H_inner, W_inner, T_inner)
-                 .faces('>X')
-                 .shell(T_wall)
+    box_inner = (boxes.make_box(H_inner, W_inner, T_inner, T_wall, '>X')
                  .faces('<X')
                  .workplane()
                  .moveTo(0, -T_inner / 2 + W_border)
@@ -45,20 +45,20 @@ def make_box_inner(H_inner, W_inner, T_inner, T_wall, W_border, tol_tight_fit):
     return box_inner
 
 
-def make_box_outer(H_inner, W_inner, T_inner, T_wall, W_border, tol_tight_fit):
-    box_outer = (cq.Workplane()
-                 .box(H_inner + T_wall + 2 * tol_tight_fit,
-                      W_inner + 2 * T_wall + tol_tight_fit,
-                      T_inner + 2 * T_wall + 2 * tol_tight_fit)
-                 .faces('>Y')
-                 .shell(T_wall)
-                 )
+def make_window_profile(H_inner, W_inner, W_border):
+    return (cq.Sketch()
+            .rect(H_inner - 2 * W_border, W_inner - 2 * W_border)
+            .vertices()
+            .fillet(W_border)
+            )
 
-    window_profile = (cq.Sketch()
-                      .rect(H_inner - 2 * W_border, W_inner - 2 * W_border)
-                      .vertices()
-                      .fillet(W_border)
-                      )
+
+def make_box_outer(H_inner, W_inner, T_inner, T_wall, W_border, tol_tight_fit,
+                   window_profile):
+    box_outer = boxes.make_box(H_inner + T_wall + 2 * tol_tight_fit,
+                               W_inner + 2 * T_wall + tol_tight_fit,
+                               T_inner + 2 * T_wall + 2 * tol_tight_fit,
+                               T_wall, '>Y')
 
     box_outer = (box_outer
                  .faces('>Z')
@@ -70,22 +70,12 @@ def make_box_outer(H_inner, W_inner, T_inner, T_wall, W_border, tol_tight_fit):
 
 
 def make_double_box_outer(H_inner, W_inner, T_deck1, T_deck2, T_wall, W_border,
-                          tol_tight_fit):
+                          tol_tight_fit, window_profile):
     T_dd_inner = T_deck1 + T_deck2 + T_wall + 4 * tol_tight_fit
 
-    double_box_outer = (cq.Workplane()
-                        .box(H_inner + T_wall + 2 * tol_tight_fit,
-                             W_inner + 2 * T_wall + tol_tight_fit,
-                             T_dd_inner)
-                        .faces('>Y')
-                        .shell(T_wall)
-                        )
-
-    window_profile = (cq.Sketch()
-                      .rect(H_inner - 2 * W_border, W_inner - 2 * W_border)
-                      .vertices()
-                      .fillet(W_border)
-                      )
+    double_box_outer = boxes.make_box(H_inner + T_wall + 2 * tol_tight_fit,
+                                      W_inner + 2 * T_wall + tol_tight_fit,
+                                      T_dd_inner, T_wall, '>Y')
 
     double_box_outer = (double_box_outer
                         .faces('>Z')
@@ -108,70 +98,32 @@ def make_double_box_outer(H_inner, W_inner, T_deck1, T_deck2, T_wall, W_border,
     return double_box_outer
 
 
-box_inner_40 = make_box_inner(
-    H_inner, W_inner, T_inner_40, T_wall, W_border, tol_tight_fit)
-box_outer_40 = make_box_outer(
-    H_inner, W_inner, T_inner_40, T_wall, W_border, tol_tight_fit)
-
-box_inner_30 = make_box_inner(
-    H_inner, W_inner, T_inner_30, T_wall, W_border, tol_tight_fit)
-box_outer_30 = make_box_outer(
-    H_inner, W_inner, T_inner_30, T_wall, W_border, tol_tight_fit)
-
-box_inner_28 = make_box_inner(
-    H_inner, W_inner, T_inner_28, T_wall, W_border, tol_tight_fit)
-box_outer_28 = make_box_outer(
-    H_inner, W_inner, T_inner_28, T_wall, W_border, tol_tight_fit)
-
-box_inner_15 = make_box_inner(
-    H_inner, W_inner, T_inner_15, T_wall, W_border, tol_tight_fit)
-box_outer_15 = make_box_outer(
-    H_inner, W_inner, T_inner_15, T_wall, W_border, tol_tight_fit)
-
-box_inner_12 = make_box_inner(
-    H_inner, W_inner, T_inner_12, T_wall, W_border, tol_tight_fit)
-box_outer_12 = make_box_outer(
-    H_inner, W_inner, T_inner_12, T_wall, W_border, tol_tight_fit)
-
-# Double deck box.
-T_deck1 = T_inner_28 + 2 * T_wall
-T_deck2 = T_inner_12 + 2 * T_wall
-
-
-double_box_outer_40_30 = make_double_box_outer(H_inner, W_inner,
-                                               T_inner_40 + 2 * T_wall,
-                                               T_inner_30 + 2 * T_wall,
-                                               T_wall, W_border,
-                                               tol_tight_fit)
-double_box_outer_28_12 = make_double_box_outer(H_inner, W_inner,
-                                               T_inner_28 + 2 * T_wall,
-                                               T_inner_12 + 2 * T_wall,
-                                               T_wall, W_border,
-                                               tol_tight_fit)
-double_box_outer_15_15 = make_double_box_outer(H_inner, W_inner,
-                                               T_inner_15 + 2 * T_wall,
-                                               T_inner_15 + 2 * T_wall,
-                                               T_wall, W_border,
-                                               tol_tight_fit)
-
-
-show_object(double_box_outer_40_30)
-
-exporters.export(box_inner_40, 'deck_box_40.stl')
-exporters.export(box_outer_40, 'deck_box_outer_40.stl')
+# Boxes of a family only differ in their thickness, so they share the window.
+window_profile = make_window_profile(H_inner, W_inner, W_border)
 
-exporters.export(box_inner_30, 'deck_box_30.stl')
-exporters.export(box_outer_30, 'deck_box_outer_30.stl')
+tasks = dict()
+for n in DECK_SIZES:
+    tasks[f'deck_box_{n}'] = functools.partial(
+        make_box_inner,
+        H_inner, W_inner, T_inners[n], T_wall, W_border, tol_tight_fit)
+    tasks[f'deck_box_outer_{n}'] = functools.partial(
+        make_box_outer,
+        H_inner, W_inner, T_inners[n], T_wall, W_border, tol_tight_fit,
+        window_profile)
 
-exporters.export(box_inner_28, 'deck_box_28.stl')
-exporters.export(box_outer_28, 'deck_box_outer_28.stl')
+for n1, n2 in DOUBLES:
+    tasks[f'double_deck_box_{n1}_{n2}'] = functools.partial(
+        make_double_box_outer,
+        H_inner, W_inner, T_inners[n1] + 2 * T_wall, T_inners[n2] + 2 * T_wall,
+        T_wall, W_border, tol_tight_fit, window_profile)
 
-exporters.export(box_inner_15, 'deck_box_15.stl')
-exporters.export(box_outer_15, 'deck_box_outer_15.stl')
+# Every box is built and exported in its own process.
+shapes = parallel.build(
+    tasks, export=lambda name, box: export.export(box, f'{name}.stl'))
 
-exporters.export(box_inner_12, 'deck_box_12.stl')
-exporters.export(box_outer_12, 'deck_box_outer_12.stl')
+show_object(shapes['double_deck_box_40_30'])
 
-exporters.export(double_box_outer_40_30, 'double_deck_box_40_30.stl')
-exporters.export(double_box_outer_28_12, 'double_deck_box_28_12.stl')
-exporters.export(double_box_outer_15_15, 'double_deck_box_15_15.stl')
+# All boxes laid out on the printer bed.
+W_bed = 220
+H_bed = 220
+plates.export_plates(plates.arrange(shapes, W_bed, H_bed), 'plate_{}.3mf')
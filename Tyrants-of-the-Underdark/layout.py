@@ -1,5 +1,4 @@
-import cadquery as cq
-from cadquery import exporters
+from inserts import boxes, cardstack, catalog, export
 
 tol_comfort = 0.3
 tol_tight_fit = 0.1
@@ -7,13 +6,11 @@ tol_tight_fit = 0.1
 T_wall = 0.8
 T_wall_reinforced = 1.2
 
-T_inner_40 = 25.5
-T_inner_30 = T_inner_40 / 40 * 30
-T_inner_28 = T_inner_40 / 40 * 28
-T_inner_15 = T_inner_40 / 40 * 15
-T_inner_12 = T_inner_40 / 40 * 12
-H_card = 92.25
-W_card = 66.5
+card = catalog.get('tyrants', 'sleeve', 'sleeved_card')
+T_inner_40, T_inner_30, T_inner_28, T_inner_15, T_inner_12 = \
+    cardstack.thicknesses(card, (40, 30, 28, 15, 12))
+H_card = card.H
+W_card = card.W
 
 W_border = 4.5
 
@@ -43,21 +40,15 @@ T_top_other = T_unit
 # W_top = 10
 
 # Side container.
-box_side = (cq.Workplane()
-            .box(W_side - 2 * T_wall_reinforced,
-                 H_side - 2 * T_wall_reinforced,
-                 T_side - T_wall_reinforced)
-            .faces('>Z')
-            .shell(T_wall_reinforced)
-            )
+box_side = boxes.make_box(W_side - 2 * T_wall_reinforced,
+                          H_side - 2 * T_wall_reinforced,
+                          T_side - T_wall_reinforced, T_wall_reinforced)
 
 # Top container.
-box_top = (cq.Workplane()
-           .box(W_top - 2 * T_wall_reinforced,
-                H_top_container - 2 * T_wall_reinforced,
-                T_top_container - T_wall_reinforced)
-           .faces('>Z')
-           .shell(T_wall_reinforced, kind='intersection')
+box_top = (boxes.make_box(W_top - 2 * T_wall_reinforced,
+                          H_top_container - 2 * T_wall_reinforced,
+                          T_top_container - T_wall_reinforced,
+                          T_wall_reinforced, kind='intersection')
            .faces('>Y')
            .workplane()
            .moveTo(0, -T_top_container / 2 - T_wall_reinforced / 2)
@@ -65,5 +56,5 @@ box_top = (cq.Workplane()
            .extrude(H_top_all - H_top_container)
            )
 
-exporters.export(box_top, 'layout_top.stl')
-exporters.export(box_side, 'layout_side.stl')
+export.export(box_top, 'layout_top.stl')
+export.export(box_side, 'layout_side.stl')
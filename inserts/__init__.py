@@ -0,0 +1,5 @@
+"""Helpers shared by the insert scripts of every game.
+
+Scripts import this package from the repository root, see
+launch-cqeditor.sh.
+"""
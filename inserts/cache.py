@@ -0,0 +1,120 @@
+"""Memoization of expensive solid tools.
+
+Functions decorated with shape_cache are called once per distinct set of
+arguments. Arguments are told apart by their repr, which must only depend on
+their value, e.g. numbers, strings or dataclasses.
+Shapes can also be kept on disk as BREP files, so they survive restarts of
+cq-editor. Set INSERTS_CACHE_DIR, or call set_store, to enable the store.
+Stored shapes are used until the module defining the function changes, see
+shape_cache for what else is part of the key.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import cadquery as cq
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_store: Optional[str] = os.environ.get('INSERTS_CACHE_DIR') or None
+Key = Tuple[str, str, str, str]
+
+_shapes: Dict[Key, cq.Shape] = dict()
+
+
+def set_store(path: Optional[str]) -> None:
+    '''Keeps cached shapes in @path. None disables the on-disk store.'''
+    global _store
+    _store = path
+
+
+def clear() -> None:
+    '''Forgets all shapes kept in memory. The on-disk store is left as is.'''
+    _shapes.clear()
+
+
+def shape_cache(func: Optional[Callable[..., cq.Workplane]] = None, *,
+                version: Optional[str] = None
+                ) -> Callable[..., cq.Workplane]:
+    '''Memoizes @func, which must return a workplane holding one shape.
+
+    A fresh workplane around the cached shape is returned on every call, so
+    callers are free to chain operations on the result.
+
+    Shapes are keyed by the arguments, the source of the whole module
+    defining @func (its helpers and class constants included) and
+    @version. Other modules, data files and cadquery itself are left out:
+    pass a new @version, as in @shape_cache(version='2'), when @func depends
+    on them and they change.
+    '''
+    if func is None:
+        return functools.partial(shape_cache, version=version)
+    try:
+        with open(inspect.getsourcefile(func), 'rb') as f:
+            source = f.read()
+    except (OSError, TypeError):
+        source = func.__qualname__.encode()
+    digest = hashlib.sha1(source)
+    if version is not None:
+        digest.update(version.encode())
+    version = digest.hexdigest()[:8]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> cq.Workplane:
+        key = _key(func.__qualname__, version, args, kwargs)
+        shape = _shapes.get(key)
+        if shape is None:
+            shape = _load(key)
+        if shape is None:
+            shape = func(*args, **kwargs).val()
+            _save(key, shape)
+        _shapes[key] = shape
+        return cq.Workplane(obj=shape)
+
+    return wrapper
+
+
+def _key(name: str, version: str, args: Tuple[Any, ...],
+         kwargs: Dict[str, Any]) -> Key:
+    '''Key of a call, the same from one run of a script to the next.
+
+    Classes (e.g. cls of a classmethod) and instances of classes defined in
+    a script are new objects on every run in cq-editor, and the repr of a
+    class depends on the module name the script was run as. Arguments are
+    therefore keyed by their repr, with classes replaced by their name.
+    '''
+    def stable(arg: Any) -> Any:
+        return arg.__qualname__ if isinstance(arg, type) else arg
+
+    return (name, version,
+            repr(tuple(stable(arg) for arg in args)),
+            repr(tuple(sorted((k, stable(v)) for k, v in kwargs.items()))))
+
+
+def _path(key: Key) -> str:
+    digest = hashlib.sha1(''.join(key).encode())
+    return os.path.join(_store, f'{key[0]}-{digest.hexdigest()}.brep')
+
+
+def _load(key: Key) -> Optional[cq.Shape]:
+    if _store is None:
+        return None
+    path = _path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return cq.Shape.importBrep(path)
+    except ValueError:
+        return None
+
+
+def _save(key: Key, shape: cq.Shape) -> None:
+    if _store is None:
+        return
+    os.makedirs(_store, exist_ok=True)
+    # Write next to the final file first, so that concurrent builds never
+    # read a partially written shape.
+    path = _path(key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    shape.exportBrep(tmp_path)
+    os.replace(tmp_path, path)
@@ -0,0 +1,126 @@
+"""Thickness of stacks of sleeved cards.
+
+Sleeved cards trap air, so a loose stack is thicker than its cards laid flat
+and the extra thickness saturates after a few cards. Per sleeve, the
+thickness of n cards is modelled as
+
+    T(n) = t * n + T_loft * (1 - exp(-n / n0))
+
+and fitted to the stacks listed in card_stacks.csv. Sleeves with a single
+stack are taken as proportional (T_loft = 0). Sleeves without stacks use the
+thickness of the catalog entry.
+
+The two stacks listed so far are not measurements but the legacy estimates
+of the scripts: the Clank '* 1.5' puffiness factor and the Tyrants 40 card
+deck box. With one stack per sleeve both models are proportional and
+nothing is fitted until measured stacks are added, with their source.
+"""
+
+import csv
+import functools
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from inserts.catalog import CuboidSpec
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'card_stacks.csv')
+
+# Saturation count used when there are too few measurements to fit it.
+N0_DEFAULT = 5
+N0_CANDIDATES = [0.5 * i for i in range(1, 101)]
+
+
+@dataclass(frozen=True)
+class StackModel:
+    t: float
+    T_loft: float = 0
+    n0: float = N0_DEFAULT
+
+    def thickness(self, n: int) -> float:
+        if self.T_loft == 0:
+            return self.t * n
+        return self.t * n + self.T_loft * (1 - math.exp(-n / self.n0))
+
+    def thicknesses(self, ns: Iterable[int]) -> List[float]:
+        return [self.thickness(n) for n in ns]
+
+    def max_cards(self, T: float) -> int:
+        '''Largest stack that fits in thickness T.'''
+        lo, hi = 0, max(1, int(T / self.t) + 1)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.thickness(mid) <= T:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+
+def fit(stacks: Sequence[Tuple[int, float]]) -> StackModel:
+    '''Least squares fit of a StackModel to (cards, thickness) pairs.'''
+    if len(stacks) == 0:
+        raise ValueError('Cannot fit a card stack without measurements')
+    if len(stacks) == 1:
+        n, T = stacks[0]
+        return StackModel(t=T / n)
+
+    n0s = N0_CANDIDATES if len(stacks) > 2 else [N0_DEFAULT]
+    best = None
+    for n0 in n0s:
+        model = _fit_linear(stacks, n0)
+        err = sum((model.thickness(n) - T) ** 2 for n, T in stacks)
+        if best is None or err < best[0]:
+            best = (err, model)
+    return best[1]
+
+
+def _fit_linear(stacks: Sequence[Tuple[int, float]], n0: float
+                ) -> StackModel:
+    # For a given n0 the model is linear in t and T_loft.
+    xs = [(n, 1 - math.exp(-n / n0)) for n, _ in stacks]
+    a = sum(x * x for x, _ in xs)
+    b = sum(x * y for x, y in xs)
+    c = sum(y * y for _, y in xs)
+    p = sum(x * T for (x, _), (_, T) in zip(xs, stacks))
+    q = sum(y * T for (_, y), (_, T) in zip(xs, stacks))
+    det = a * c - b * b
+    if abs(det) > 1e-12:
+        t = (p * c - q * b) / det
+        T_loft = (a * q - b * p) / det
+        if t > 0 and T_loft >= 0:
+            return StackModel(t=t, T_loft=T_loft, n0=n0)
+    return StackModel(t=p / a)
+
+
+@functools.cache
+def _measurements(path: str = DATA_PATH
+                  ) -> Dict[Tuple[str, str], List[Tuple[int, float]]]:
+    stacks = dict()
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            key = (row['game'], row['sleeve'])
+            stacks.setdefault(key, list()).append(
+                (int(row['cards']), float(row['thickness'])))
+    return stacks
+
+
+@functools.cache
+def model(card: CuboidSpec) -> StackModel:
+    '''Stack model of a sleeve (or card) from the catalog.'''
+    stacks = _measurements().get((card.game, card.name))
+    if stacks is None:
+        if card.T <= 0:
+            raise ValueError(f'No stacks measured for {card.name} of '
+                             f'{card.game} and no thickness in the catalog')
+        return StackModel(t=card.T)
+    return fit(stacks)
+
+
+def thickness(card: CuboidSpec, n: int) -> float:
+    return model(card).thickness(n)
+
+
+def thicknesses(card: CuboidSpec, ns: Iterable[int]) -> List[float]:
+    return model(card).thicknesses(ns)
@@ -0,0 +1,121 @@
+"""Catalog of the components (cards, sleeves, tokens, ...) of every game.
+
+Dimensions are kept in components.csv, one row per component. A missing
+thickness means it was never measured and reads as 0.
+
+    from inserts import catalog
+
+    sleeve = catalog.get('clank', 'sleeve', 'dragon_shield')
+    sleeves = catalog.fitting(95, 70, kind='sleeve')
+"""
+
+import bisect
+import csv
+import functools
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'components.csv')
+
+
+@dataclass(frozen=True, slots=True)
+class CuboidSpec:
+    game: str
+    kind: str
+    name: str
+    width: float
+    height: float
+    thickness: float = 0
+
+    @property
+    def W(self) -> float:
+        return self.width
+
+    @property
+    def H(self) -> float:
+        return self.height
+
+    @property
+    def T(self) -> float:
+        return self.thickness
+
+
+class Catalog:
+    '''Components indexed by name, game and kind.'''
+
+    def __init__(self, specs: List[CuboidSpec]) -> None:
+        self._by_key: Dict[Tuple[str, str, str], CuboidSpec] = dict()
+        self._by_group: Dict[Tuple[Optional[str], Optional[str]],
+                             List[CuboidSpec]] = dict()
+        for spec in specs:
+            key = (spec.game, spec.kind, spec.name)
+            if key in self._by_key:
+                raise ValueError(f'Duplicate component {key}')
+            self._by_key[key] = spec
+            for group in ((None, None), (spec.game, None),
+                          (None, spec.kind), (spec.game, spec.kind)):
+                self._by_group.setdefault(group, list()).append(spec)
+
+        # Specs of every group sorted by width, so the ones narrow enough
+        # for a space are a prefix found by bisection.
+        self._widths: Dict[Tuple[Optional[str], Optional[str]],
+                           List[float]] = dict()
+        for group, group_specs in self._by_group.items():
+            group_specs.sort(key=lambda s: s.W)
+            self._widths[group] = [s.W for s in group_specs]
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __iter__(self):
+        return iter(self._by_key.values())
+
+    def get(self, game: str, kind: str, name: str) -> CuboidSpec:
+        try:
+            return self._by_key[(game, kind, name)]
+        except KeyError:
+            raise KeyError(f'No {kind} {name} in {game}') from None
+
+    def select(self, game: Optional[str] = None, kind: Optional[str] = None
+               ) -> Tuple[CuboidSpec, ...]:
+        '''Components of @game and/or @kind, narrowest first.'''
+        return tuple(self._by_group.get((game, kind), ()))
+
+    @functools.lru_cache(maxsize=None)
+    def fitting(self, W: float, H: float,
+                game: Optional[str] = None,
+                kind: Optional[str] = None,
+                rotatable: bool = True,
+                ) -> Tuple[CuboidSpec, ...]:
+        '''Components of @game and/or @kind that fit in a W x H space.
+
+        With @rotatable, components also fit when turned by 90 degrees.
+        '''
+        specs = self._by_group.get((game, kind), [])
+        widths = self._widths.get((game, kind), [])
+        fit = specs[:bisect.bisect_right(widths, W)]
+        if rotatable:
+            fit += specs[:bisect.bisect_right(widths, H)]
+        return tuple(dict.fromkeys(
+            s for s in fit
+            if (s.W <= W and s.H <= H) or (rotatable and s.W <= H
+                                           and s.H <= W)))
+
+
+def load(path: str = DATA_PATH) -> Catalog:
+    with open(path, newline='') as f:
+        specs = [CuboidSpec(game=row['game'],
+                            kind=row['kind'],
+                            name=row['name'],
+                            width=float(row['width']),
+                            height=float(row['height']),
+                            thickness=float(row['thickness'] or 0))
+                 for row in csv.DictReader(f)]
+    return Catalog(specs)
+
+
+catalog = load()
+get = catalog.get
+select = catalog.select
+fitting = catalog.fitting
@@ -0,0 +1,195 @@
+"""Client of the warm build server (see inserts.server).
+
+Importing cadquery, OCCT and cq_gears takes seconds, often longer than the
+script itself. The server imports them once and forks a worker from that
+state for every script or builder call it is sent, so that runs start within
+milliseconds. Their output, exports and shown objects stream back to the
+client, which only imports cadquery to read shapes sent back.
+
+    python -m inserts.daemon serve &
+    cd Clank-Catacombs && python -m inserts.daemon run tile.py
+    python -m inserts.daemon stop
+
+Without a running server, scripts are run in the client's process. Workers
+run with the client's INSERTS_* settings (preview, finishing, cache store)
+and PYTHONPATH. Shapes cached by inserts.cache are shared between runs
+through the on-disk store only (INSERTS_CACHE_DIR).
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import runpy
+import socket
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import (TYPE_CHECKING, Any, Dict, List, Optional, Sequence,
+                    TextIO, Tuple)
+
+if TYPE_CHECKING:
+    import cadquery as cq
+
+SOCKET = (os.environ.get('INSERTS_DAEMON_SOCKET')
+          or os.path.join(tempfile.gettempdir(),
+                          f'inserts-daemon-{os.getuid()}.sock'))
+# Environment of the client passed on to the worker.
+SETTINGS = ('INSERTS_PREVIEW', 'INSERTS_NO_FINISH', 'INSERTS_CACHE_DIR',
+            'PYTHONPATH')
+
+Message = Dict[str, Any]
+
+
+class DaemonError(RuntimeError):
+    '''A script or call failed in the server, with the worker's traceback.'''
+
+
+@dataclass
+class Result:
+    # Paths exported, and whether they were written.
+    exports: List[Tuple[str, bool]] = field(default_factory=list)
+    # Objects passed to show_object, if requested, with their names.
+    shown: List[Tuple[Optional[str], 'cq.Shape']] = field(
+        default_factory=list)
+    # Value returned by a builder call.
+    value: Optional['cq.Shape'] = None
+    seconds: float = 0
+
+
+def running(path: str = SOCKET) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(path)
+    except OSError:
+        return False
+    return True
+
+
+def run(script: str, args: Sequence[str] = (), path: str = SOCKET,
+        show: bool = False, run_name: str = '__main__',
+        stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None
+        ) -> Result:
+    '''Runs @script with @args in the server, from the current directory.
+
+    Its output goes to @stdout and @stderr (default: sys.stdout and
+    sys.stderr). With @show, objects passed to show_object are sent back.
+    Scripts written for cq-editor run with @run_name '__cq_main__'.
+    '''
+    return _request(path, {
+        'type': 'run',
+        'script': os.path.abspath(script),
+        'args': list(args),
+        'show': show,
+        'run_name': run_name,
+    }, stdout, stderr)
+
+
+def call(target: str, *args, path: str = SOCKET, **kwargs) -> 'cq.Shape':
+    '''Calls the builder @target ('module:function') with JSON arguments in
+    the server and returns the shape it builds.
+    '''
+    return _request(path, {
+        'type': 'call',
+        'target': target,
+        'args': list(args),
+        'kwargs': kwargs,
+    }, None, None).value
+
+
+def stop(path: str = SOCKET) -> None:
+    _request(path, {'type': 'stop'}, None, None)
+
+
+def send(conn: socket.socket, message: Message) -> None:
+    conn.sendall(json.dumps(message).encode() + b'\n')
+
+
+def _request(path: str, request: Message, stdout: Optional[TextIO],
+             stderr: Optional[TextIO]) -> Result:
+    streams = {'stdout': stdout or sys.stdout, 'stderr': stderr or sys.stderr}
+    request['cwd'] = os.getcwd()
+    request['env'] = {name: os.environ[name] for name in SETTINGS
+                      if name in os.environ}
+    result = Result()
+    error = None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        send(s, request)
+        with s.makefile('rb') as f:
+            for line in f:
+                message = json.loads(line)
+                kind = message['type']
+                if kind in streams:
+                    streams[kind].write(message['data'])
+                elif kind == 'export':
+                    result.exports.append((message['path'],
+                                           message['changed']))
+                elif kind == 'show':
+                    result.shown.append((message['name'],
+                                         _decode(message['brep'])))
+                elif kind == 'value':
+                    result.value = _decode(message['brep'])
+                elif kind == 'error':
+                    error = message['traceback']
+                elif kind == 'done':
+                    result.seconds = message['seconds']
+                    break
+    if error is not None:
+        raise DaemonError(error)
+    return result
+
+
+def _decode(data: str) -> 'cq.Shape':
+    import cadquery as cq
+    return cq.Shape.importBrep(io.BytesIO(base64.b64decode(data)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m inserts.daemon',
+        description='Runs insert scripts in a warm build server.')
+    parser.add_argument('--socket', default=SOCKET)
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help='start the server')
+    serve_parser.add_argument('--preload', nargs='*', default=[],
+                              help='more modules to import')
+    run_parser = commands.add_parser('run', help='run a script')
+    run_parser.add_argument('--cq-main', action='store_true',
+                            help='run as cq-editor does')
+    run_parser.add_argument('script')
+    run_parser.add_argument('args', nargs=argparse.REMAINDER)
+    commands.add_parser('stop', help='stop the server')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        from inserts import server
+        server.serve(args.socket, server.PRELOAD + args.preload)
+        return 0
+    if args.command == 'stop':
+        stop(args.socket)
+        return 0
+
+    run_name = '__cq_main__' if args.cq_main else '__main__'
+    if not running(args.socket):
+        print('No server running, running in this process', file=sys.stderr)
+        sys.argv = [args.script] + args.args
+        sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+        runpy.run_path(args.script,
+                       init_globals={'show_object': lambda *_, **__: None},
+                       run_name=run_name)
+        return 0
+    try:
+        result = run(args.script, args.args, args.socket, run_name=run_name)
+    except DaemonError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for path, changed in result.exports:
+        if changed:
+            print(f'Exported {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Exports of parts to files.
+
+Parts are only exported at full fidelity: in preview mode (see
+inserts.preview) exports are skipped so proxies never reach a printer. 3MF
+files are written by inserts.threemf, which names the parts.
+
+Files are only replaced when their content changes, so unchanged parts keep
+their modification time and are neither synced nor re-imported by slicers.
+Every directory exported to keeps a manifest.json with the hash, size and
+build time of its files, where the build time of a part is the time since
+the previous export (or since reset_timer). Entries are only rewritten when
+their file or fingerprint changes, so timings are those of that export.
+
+OCCT meshes the same geometry differently from one process to the next, so
+parts are first compared by a fingerprint of their faces: a part whose
+fingerprint and file match the manifest is not exported again. Otherwise the
+new file is compared by hash, ignoring the timestamp of STEP files.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import re
+import time
+import cadquery as cq
+from cadquery import exporters
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from inserts import preview, threemf
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MANIFEST = 'manifest.json'
+# Precision of the fingerprints of parts.
+DECIMALS = 4
+
+# Called with the path and whether the file was written after every export.
+listeners: List[Callable[[str, bool], None]] = list()
+
+_last = time.monotonic()
+
+
+def export(part: Union[cq.Workplane, cq.Shape, threemf.Model], path: str,
+           **kwargs) -> bool:
+    '''Exports @part to @path, creating its directory.
+
+    Returns whether the file was written, i.e. its content changed.
+    '''
+    global _last
+    if preview.active():
+        print(f'Preview mode, not exporting {path}')
+        return False
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    start = time.monotonic()
+
+    fingerprint = _fingerprint(part, path, kwargs)
+    previous = read_manifest(directory).get(os.path.basename(path), dict())
+    digest = _file_hash(path)
+    if (previous.get('fingerprint') == fingerprint
+            and previous.get('sha256') == digest):
+        changed = False
+        size = os.path.getsize(path)
+    else:
+        # Written next to the file, which it replaces only if it changed.
+        # The extension is kept as it picks the format.
+        name, ext = os.path.splitext(os.path.basename(path))
+        tmp = os.path.join(directory, f'.{name}.{os.getpid()}{ext}')
+        try:
+            _write(part, tmp, path, **kwargs)
+            with open(tmp, 'rb') as f:
+                data = f.read()
+            changed = _hash(path, data) != digest
+            if changed:
+                os.replace(tmp, path)
+            digest = _hash(path, data)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        size = len(data)
+
+    end = time.monotonic()
+    _update_manifest(directory, os.path.basename(path), {
+        'fingerprint': fingerprint,
+        'sha256': digest,
+        'size': size,
+        'build_seconds': round(start - _last, 3),
+        'export_seconds': round(end - start, 3),
+    }, changed)
+    _last = end
+    for listener in listeners:
+        listener(path, changed)
+    return changed
+
+
+def reset_timer() -> None:
+    '''Starts timing the build of the next part exported.'''
+    global _last
+    _last = time.monotonic()
+
+
+def read_manifest(directory: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            content = f.read()
+    except FileNotFoundError:
+        return dict()
+    return json.loads(content) if content else dict()
+
+
+def _write(part: Union[cq.Workplane, cq.Shape, threemf.Model], tmp: str,
+           path: str, **kwargs) -> None:
+    if isinstance(part, threemf.Model):
+        part.write(tmp)
+    elif path.lower().endswith('.3mf'):
+        name = os.path.splitext(os.path.basename(path))[0]
+        threemf.write(part, tmp, name, **kwargs)
+    else:
+        exporters.export(part, tmp, **kwargs)
+
+
+def _fingerprint(part: Union[cq.Workplane, cq.Shape, threemf.Model],
+                 path: str, kwargs: Dict[str, Any]) -> str:
+    '''Hash of the faces of @part, as placed, and of how it is exported.'''
+    if isinstance(part, threemf.Model):
+        options = (part.tolerance, part.angular_tolerance)
+        parts = part.parts
+    else:
+        options = sorted(kwargs.items())
+        shapes = part.vals() if isinstance(part, cq.Workplane) else [part]
+        parts = [(None, shape, None) for shape in shapes]
+
+    h = hashlib.sha256(repr((os.path.splitext(path)[1].lower(), options))
+                       .encode())
+    for name, shape, color in parts:
+        # Faces are sorted as their order is not stable across processes,
+        # nor is the sign of coordinates close to zero (+ 0.0 drops it).
+        faces = sorted((face.geomType(), round(face.Area(), DECIMALS),
+                        tuple(round(c, DECIMALS) + 0.0
+                              for c in face.Center().toTuple()))
+                       for face in shape.Faces())
+        h.update(repr((name, color, faces)).encode())
+    return h.hexdigest()
+
+
+def _hash(path: str, data: bytes) -> str:
+    if path.lower().endswith(('.step', '.stp')):
+        # The header holds the time of the export.
+        data = re.sub(rb"(FILE_NAME\('[^']*',)'[^']*'", rb"\1''", data,
+                      count=1)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return _hash(path, f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _update_manifest(directory: str, name: str, entry: Dict[str, Any],
+                     changed: bool) -> None:
+    # Parts may be exported by several processes at once (inserts.parallel).
+    with open(os.path.join(directory, MANIFEST), 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        content = f.read()
+        manifest = json.loads(content) if content else dict()
+        previous = manifest.get(name, dict())
+        # Timings differ on every run, so they alone never rewrite the
+        # manifest, which would then be synced with no part changed.
+        if not changed and all(previous.get(key) == entry[key]
+                               for key in ('fingerprint', 'sha256', 'size')):
+            return
+        entry['updated'] = previous.get('updated')
+        if changed or entry['updated'] is None:
+            entry['updated'] = (datetime.datetime.now(datetime.timezone.utc)
+                                .isoformat(timespec='seconds'))
+        manifest[name] = entry
+        f.seek(0)
+        f.truncate()
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
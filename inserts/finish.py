@@ -0,0 +1,174 @@
+"""Fillets and chamfers applied as a last step.
+
+Finishing requests are collected by edge selector and applied together:
+consecutive fillets in a single OCCT fillet operation, consecutive chamfers
+in a single chamfer operation, each edge with its own size. When OCCT fails
+on a batch, its edges are bisected to find the ones that cannot be finished.
+
+    box = (finish.Finish(box)
+           .fillet('|Z', R)
+           .chamfer(lambda wp: wp.faces('>Z'), T)
+           .build())
+
+Selectors are edge selectors (None for every edge) or functions of the body
+returning the edges (or faces) to finish. Setting INSERTS_NO_FINISH=1,
+building within finish.skipped() or in preview mode leaves bodies
+unfinished.
+"""
+
+import contextlib
+import itertools
+import os
+import warnings
+import cadquery as cq
+from dataclasses import dataclass
+from typing import (Callable, Iterator, List, Optional, Self, Sequence, Tuple,
+                    Union)
+
+from OCP.BRepFilletAPI import (BRepFilletAPI_MakeChamfer,
+                               BRepFilletAPI_MakeFillet)
+from OCP.Standard import Standard_Failure
+from OCP.TopAbs import TopAbs_EDGE, TopAbs_FACE
+from OCP.TopExp import TopExp
+from OCP.TopTools import TopTools_IndexedDataMapOfShapeListOfShape
+from OCP.TopoDS import TopoDS
+
+from inserts import preview
+
+Selector = Union[None, str, cq.Selector,
+                 Callable[[cq.Workplane], cq.Workplane]]
+Sizes = Sequence[Tuple[cq.Edge, float]]
+
+_skip = os.environ.get('INSERTS_NO_FINISH', '') not in ('', '0')
+
+
+class FinishError(ValueError):
+    '''OCCT could not finish @edges.'''
+
+    def __init__(self, kind: str, edges: List[cq.Edge]) -> None:
+        centers = ', '.join(str(e.Center().toTuple()) for e in edges)
+        super().__init__(f'Cannot {kind} {len(edges)} edge(s) at {centers}')
+        self.kind = kind
+        self.edges = edges
+
+
+@dataclass(frozen=True)
+class _Request:
+    kind: str
+    selector: Selector
+    size: float
+
+
+class Finish:
+    '''Fillets and chamfers of a body, built at once.'''
+
+    def __init__(self, wp: cq.Workplane) -> None:
+        self._wp = wp
+        self._requests: List[_Request] = list()
+
+    def fillet(self, selector: Selector, R: float) -> Self:
+        self._requests.append(_Request('fillet', selector, R))
+        return self
+
+    def chamfer(self, selector: Selector, d: float) -> Self:
+        self._requests.append(_Request('chamfer', selector, d))
+        return self
+
+    def build(self, skip_failed: bool = False) -> cq.Workplane:
+        '''Applies the requests in order, batching consecutive ones of a kind.
+
+        Selectors of a batch see the body finished by the previous batches.
+        With @skip_failed, edges that cannot be finished are left sharp with a
+        warning instead of raising a FinishError.
+        '''
+        if _skip or preview.active() or not self._requests:
+            return self._wp
+
+        solid = self._wp.findSolid()
+        for kind, requests in itertools.groupby(self._requests,
+                                                key=lambda r: r.kind):
+            wp = cq.Workplane(obj=solid)
+            # Edges selected again take the last size.
+            sizes = dict()
+            for request in requests:
+                for edge in _select(wp, request.selector):
+                    sizes[edge] = request.size
+            if not sizes:
+                raise ValueError(f'No edges selected to {kind}')
+            solid = _apply(solid, kind, list(sizes.items()), skip_failed)
+        return self._wp.newObject([solid])
+
+
+@contextlib.contextmanager
+def skipped(on: bool = True) -> Iterator[None]:
+    '''Leaves bodies built within unfinished (or finishes them).'''
+    global _skip
+    previous, _skip = _skip, on
+    try:
+        yield
+    finally:
+        _skip = previous
+
+
+def _select(wp: cq.Workplane, selector: Selector) -> List[cq.Edge]:
+    if callable(selector):
+        return selector(wp).edges().vals()
+    return wp.edges(selector).vals()
+
+
+def _apply(solid: cq.Shape, kind: str, sizes: Sizes, skip_failed: bool
+           ) -> cq.Shape:
+    result = _try(solid, kind, sizes)
+    if result is not None:
+        return result
+
+    bad = _isolate(solid, kind, sizes)
+    if not skip_failed:
+        raise FinishError(kind, bad)
+    warnings.warn(str(FinishError(kind, bad)))
+    good = [(e, size) for e, size in sizes if e not in bad]
+    if not good:
+        return solid
+    result = _try(solid, kind, good)
+    if result is None:
+        raise FinishError(kind, [e for e, _ in sizes])
+    return result
+
+
+def _isolate(solid: cq.Shape, kind: str, sizes: Sizes) -> List[cq.Edge]:
+    '''Smallest failing groups of edges found by bisection.'''
+    if len(sizes) == 1:
+        return [sizes[0][0]]
+    half = len(sizes) // 2
+    bad = list()
+    for part in (sizes[:half], sizes[half:]):
+        if _try(solid, kind, part) is None:
+            bad += _isolate(solid, kind, part)
+    # Both halves work on their own but not together.
+    return bad or [e for e, _ in sizes]
+
+
+def _try(solid: cq.Shape, kind: str, sizes: Sizes) -> Optional[cq.Shape]:
+    if kind == 'fillet':
+        builder = BRepFilletAPI_MakeFillet(solid.wrapped)
+        for edge, R in sizes:
+            builder.Add(R, edge.wrapped)
+    else:
+        edge_faces = TopTools_IndexedDataMapOfShapeListOfShape()
+        TopExp.MapShapesAndAncestors_s(solid.wrapped, TopAbs_EDGE,
+                                       TopAbs_FACE, edge_faces)
+        builder = BRepFilletAPI_MakeChamfer(solid.wrapped)
+        for edge, d in sizes:
+            face = TopoDS.Face_s(edge_faces.FindFromKey(edge.wrapped).First())
+            builder.Add(d, d, edge.wrapped, face)
+
+    try:
+        builder.Build()
+        if not builder.IsDone():
+            return None
+        result = solid.__class__(builder.Shape())
+    except Standard_Failure:
+        return None
+    if not result.isValid():
+        return None
+    return result.clean()
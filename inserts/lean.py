@@ -0,0 +1,56 @@
+"""Workplanes that forget their construction history.
+
+Every step of a cadquery chain keeps the step before it as its parent, so a
+long chain keeps every intermediate solid alive until the part itself is
+dropped. A lean workplane only keeps what the next steps can use: the step
+before it and the last solid built, if that step has none.
+
+    part = (lean.Workplane()
+            .box(W, H, T)
+            .faces('>Z')
+            .workplane()
+            .tag('top')
+            .hole(D)
+            )
+
+Tags keep the plane and the objects of the tagged step, not the solid built
+before it, which is all workplaneFromTagged needs. Selecting with tag=
+therefore only works on steps holding their own objects, and end() only
+reaches back one step. Peak memory follows the part being built rather than
+its history, which matters when many parts build in parallel.
+"""
+
+from copy import copy
+from typing import Iterable
+
+import cadquery as cq
+from cadquery.cq import CQObject
+
+
+class Workplane(cq.Workplane):
+    '''cq.Workplane whose steps drop the history of the steps before them.'''
+
+    def newObject(self, objlist: Iterable[CQObject]) -> 'Workplane':
+        ns = super().newObject(objlist)
+        ns.parent = self._detached()
+        return ns
+
+    def tag(self, name: str) -> 'Workplane':
+        self._tag = name
+        tagged = copy(self)
+        tagged.objects = list(self.objects)
+        tagged.parent = None
+        self.ctx.tags[name] = tagged
+        return self
+
+    def _detached(self) -> 'Workplane':
+        '''Copy of this step whose parent only holds the last solid built.'''
+        wp = copy(self)
+        wp.objects = list(self.objects)
+        wp.parent = None
+        if self._findType((cq.Solid,), searchParents=False) is None:
+            solid = self._findType((cq.Solid,), searchStack=False)
+            if solid is not None:
+                wp.parent = copy(wp)
+                wp.parent.objects = [solid]
+        return wp
@@ -0,0 +1,280 @@
+"""3D guillotine bin packing of inserts into a game box.
+
+Arrangements are scored on bounding boxes only, so thousands of them can be
+tried per second before any solid is built. The free space left over by the
+best arrangement is returned as cuboids that can be turned into filler boxes.
+"""
+
+import itertools
+import random
+import cadquery as cq
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+
+from inserts import boxes
+
+EPS = 1e-6
+
+# Order in which the leftover space around a placed item is cut. Each entry
+# lists the axes (0: W, 1: H, 2: T) from first to last cut.
+SPLIT_ORDERS = list(itertools.permutations((0, 1, 2)))
+
+
+@dataclass(frozen=True)
+class Cuboid:
+    '''Axis-aligned box given by its minimum corner and its extents.'''
+    x: float
+    y: float
+    z: float
+    width: float
+    height: float
+    thickness: float
+
+    @property
+    def W(self) -> float:
+        return self.width
+
+    @property
+    def H(self) -> float:
+        return self.height
+
+    @property
+    def T(self) -> float:
+        return self.thickness
+
+    @property
+    def volume(self) -> float:
+        return self.width * self.height * self.thickness
+
+    @property
+    def center(self) -> Tuple[float, float, float]:
+        return (self.x + self.width / 2,
+                self.y + self.height / 2,
+                self.z + self.thickness / 2)
+
+
+@dataclass(frozen=True)
+class Item:
+    '''Bounding box of an insert. Only rotations about Z are allowed.'''
+    name: str
+    width: float
+    height: float
+    thickness: float
+    rotatable: bool = True
+
+    @property
+    def W(self) -> float:
+        return self.width
+
+    @property
+    def H(self) -> float:
+        return self.height
+
+    @property
+    def T(self) -> float:
+        return self.thickness
+
+    @property
+    def volume(self) -> float:
+        return self.width * self.height * self.thickness
+
+
+@dataclass(frozen=True)
+class Placement:
+    item: Item
+    cuboid: Cuboid
+    rotated: bool
+
+
+@dataclass
+class Packing:
+    box: Cuboid
+    placements: List[Placement] = field(default_factory=list)
+    free: List[Cuboid] = field(default_factory=list)
+    unplaced: List[Item] = field(default_factory=list)
+    min_filler: float = 0
+
+    @property
+    def unplaced_volume(self) -> float:
+        return sum(item.volume for item in self.unplaced)
+
+    @property
+    def waste(self) -> float:
+        '''Free volume too thin to be used by a filler box.'''
+        return sum(c.volume for c in self.free
+                   if min(c.W, c.H, c.T) < self.min_filler)
+
+    def fillers(self) -> List[Cuboid]:
+        '''Free cuboids large enough for a filler box, largest first.'''
+        fillers = [c for c in self.free
+                   if min(c.W, c.H, c.T) >= self.min_filler]
+        return sorted(fillers, key=lambda c: c.volume, reverse=True)
+
+
+def pack(box: object,
+         items: Sequence[Item],
+         min_filler: float = 10,
+         n_trials: int = 2000,
+         seed: int = 0
+         ) -> Packing:
+    '''Packs @items into @box, minimizing the wasted volume.
+
+    @box is anything with W, H and T (e.g. GameBoxInner). Arrangements are
+    tried in order of a few greedy orderings and then random ones, each with
+    every guillotine split order. Packings that place more volume win, then
+    those that waste less volume in free space thinner than @min_filler.
+    '''
+    W_box, H_box, T_box = box.W, box.H, box.T
+    dims = [(item.W, item.H, item.T, item.rotatable) for item in items]
+
+    rng = random.Random(seed)
+    best_key = None
+    best = None
+    for order in _orders(items, n_trials, rng):
+        for split in SPLIT_ORDERS:
+            placed, free, unplaced = _pack_once(W_box, H_box, T_box,
+                                                dims, order, split)
+            unplaced_volume = sum(dims[i][0] * dims[i][1] * dims[i][2]
+                                  for i in unplaced)
+            waste = sum(w * h * t for _, _, _, w, h, t in free
+                        if min(w, h, t) < min_filler)
+            key = (unplaced_volume, waste)
+            if best_key is None or key < best_key:
+                best_key = key
+                best = (placed, free, unplaced)
+
+    placed, free, unplaced = best
+    packing = Packing(box=Cuboid(0, 0, 0, W_box, H_box, T_box),
+                      min_filler=min_filler)
+    for i, x, y, z, w, h, rotated in placed:
+        packing.placements.append(Placement(
+            item=items[i],
+            cuboid=Cuboid(x, y, z, w, h, items[i].T),
+            rotated=rotated))
+    packing.free = [Cuboid(*c) for c in free]
+    packing.unplaced = [items[i] for i in unplaced]
+    return packing
+
+
+def make_filler_boxes(packing: Packing,
+                      T_wall: float = 1.2,
+                      tol: float = 0.25,
+                      ) -> List[Tuple[Cuboid, cq.Workplane]]:
+    '''Makes an open-top box for every filler cuboid of @packing.
+
+    Boxes are shrunk by @tol on each side and placed at their cuboid.
+    '''
+    fillers = list()
+    for c in packing.fillers():
+        W = c.W - 2 * tol
+        H = c.H - 2 * tol
+        T = c.T - tol
+        x, y, _ = c.center
+        # The floor of the box is T_wall below its inner space.
+        filler = (boxes.make_box(W - 2 * T_wall, H - 2 * T_wall, T - T_wall,
+                                 T_wall)
+                  .translate((x, y, c.z + (T + T_wall) / 2))
+                  )
+        fillers.append((c, filler))
+    return fillers
+
+
+def _orders(items: Sequence[Item], n_trials: int, rng: random.Random
+            ) -> Iterable[Tuple[int, ...]]:
+    idxs = list(range(len(items)))
+    greedy = [
+        lambda i: items[i].volume,
+        lambda i: items[i].W * items[i].H,
+        lambda i: max(items[i].W, items[i].H, items[i].T),
+        lambda i: items[i].T,
+    ]
+    seen = set()
+    for key in greedy:
+        order = tuple(sorted(idxs, key=key, reverse=True))
+        if order not in seen:
+            seen.add(order)
+            yield order
+    for _ in range(n_trials):
+        order = idxs[:]
+        rng.shuffle(order)
+        order = tuple(order)
+        if order not in seen:
+            seen.add(order)
+            yield order
+
+
+def _pack_once(W_box: float, H_box: float, T_box: float,
+               dims: List[Tuple[float, float, float, bool]],
+               order: Tuple[int, ...],
+               split: Tuple[int, int, int]):
+    '''Greedy best-volume-fit packing of a single arrangement.
+
+    Works on plain tuples since this is the hot loop of pack().
+    '''
+    free = [(0.0, 0.0, 0.0, W_box, H_box, T_box)]
+    placed = list()
+    unplaced = list()
+    for i in order:
+        w_item, h_item, t_item, rotatable = dims[i]
+        best = None
+        for fi, (fx, fy, fz, fw, fh, ft) in enumerate(free):
+            if t_item > ft + EPS:
+                continue
+            for w, h, rotated in ((w_item, h_item, False),
+                                  (h_item, w_item, True)):
+                if rotated and (not rotatable or w_item == h_item):
+                    continue
+                if w > fw + EPS or h > fh + EPS:
+                    continue
+                leftover = fw * fh * ft - w * h * t_item
+                if best is None or leftover < best[0]:
+                    best = (leftover, fi, w, h, rotated)
+        if best is None:
+            unplaced.append(i)
+            continue
+
+        _, fi, w, h, rotated = best
+        fx, fy, fz, fw, fh, ft = free.pop(fi)
+        placed.append((i, fx, fy, fz, w, h, rotated))
+
+        # Guillotine cut the leftover space, one axis at a time. Each cut
+        # takes the whole remaining extent on the axes not yet cut.
+        extents = [fw, fh, ft]
+        used = (w, h, t_item)
+        origin = (fx, fy, fz)
+        for axis in split:
+            rest = extents[axis] - used[axis]
+            if rest > EPS:
+                corner = list(origin)
+                corner[axis] += used[axis]
+                size = list(extents)
+                size[axis] = rest
+                free.append((*corner, *size))
+            extents[axis] = used[axis]
+
+    return placed, free, unplaced
+
+
+if __name__ == '__cq_main__':
+    # Clank! Catacombs inserts (see Clank-Catacombs/*.py for the numbers).
+    class GameBoxInner:
+        W = 291
+        H = 291
+        T = 78.5
+
+    items = [
+        Item('tile_box', 207.2, 104.6, 27.6),
+        Item('reserve_shop', 104.6, 206.1, 15.72),
+        Item('market_shop', 133, 65.8, 23.4),
+        Item('coin_box', 156.5, 65.8, 23.4),
+        Item('deck_player', 96.5, 87.2, 35),
+        Item('deck_dungeon', 96.5, 87.2, 35),
+    ]
+    packing = pack(GameBoxInner, items)
+    for p in packing.placements:
+        print(p.item.name, p.cuboid, 'rotated' if p.rotated else '')
+    print('unplaced', [item.name for item in packing.unplaced])
+    print('waste', packing.waste)
+
+    for c, filler in make_filler_boxes(packing):
+        show_object(filler, name=f'filler {c.W:.1f}x{c.H:.1f}x{c.T:.1f}')
@@ -0,0 +1,99 @@
+"""Builds independent parts concurrently.
+
+Every part is built, and optionally exported, in a forked child process, so
+a family of parts takes about as long as its slowest member. Forking avoids
+pickling the build functions, which are usually closures defined by a
+script. Where fork is not available parts are built one after the other,
+as they are by default on macOS and inside cq-editor: forking a
+multithreaded GUI process is unsafe and may crash the children.
+"""
+
+import io
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import traceback
+import cadquery as cq
+from typing import Callable, Dict, Mapping, Optional
+
+from inserts import export as exports
+
+Task = Callable[[], cq.Workplane]
+Export = Callable[[str, cq.Workplane], None]
+
+
+def build(tasks: Mapping[str, Task],
+          export: Optional[Export] = None,
+          processes: Optional[int] = None,
+          ) -> Dict[str, cq.Shape]:
+    '''Runs every task of @tasks and returns the built shapes by name.
+
+    @export is called with the name and the result of every task, in the
+    process that built it. At most @processes tasks (default: one per CPU,
+    or one on macOS and inside cq-editor) run at once.
+    '''
+    if processes is None:
+        processes = (os.cpu_count() or 1) if _fork_safe() else 1
+    if processes <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return {name: _run(name, task, export).val()
+                for name, task in tasks.items()}
+
+    ctx = multiprocessing.get_context('fork')
+    pending = list(tasks.items())
+    running = dict()
+    shapes = dict()
+    try:
+        while pending or running:
+            while pending and len(running) < processes:
+                name, task = pending.pop(0)
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_child,
+                                      args=(name, task, export, send_conn),
+                                      daemon=True)
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (name, process)
+
+            for conn in multiprocessing.connection.wait(list(running)):
+                name, process = running.pop(conn)
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    status, payload = 'error', 'process died'
+                conn.close()
+                process.join()
+                if status == 'error':
+                    raise RuntimeError(f'Building {name} failed:\n{payload}')
+                shapes[name] = cq.Shape.importBrep(io.BytesIO(payload))
+    finally:
+        for _, process in running.values():
+            process.terminate()
+
+    # Keep the order of the tasks.
+    return {name: shapes[name] for name in tasks}
+
+
+def _fork_safe() -> bool:
+    return sys.platform != 'darwin' and 'cq_editor' not in sys.modules
+
+
+def _run(name: str, task: Task, export: Optional[Export]) -> cq.Workplane:
+    exports.reset_timer()
+    result = task()
+    if export is not None:
+        export(name, result)
+    return result
+
+
+def _child(name: str, task: Task, export: Optional[Export],
+           conn: multiprocessing.connection.Connection) -> None:
+    try:
+        result = _run(name, task, export)
+        brep = io.BytesIO()
+        result.val().exportBrep(brep)
+        conn.send(('ok', brep.getvalue()))
+    except BaseException:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        conn.close()
@@ -0,0 +1,227 @@
+"""Arranges parts on the build plates of a printer.
+
+Every part is laid on its print face, the largest flat face it can stand on,
+and packed by its footprint onto as few plates as possible with the
+MaxRects heuristic (best short side fit). Plates are centered on the origin
+and exported one file (STL, 3MF, ...) per plate. Parts are only moved, so
+the copies of a part share one mesh in 3MF files.
+
+    arranged = plates.arrange(shapes, W_bed=220, H_bed=220)
+    plates.export_plates(arranged, os.path.join('models', 'plate_{}.3mf'))
+"""
+
+import math
+import cadquery as cq
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from OCP.Bnd import Bnd_Box
+from OCP.BRepBndLib import BRepBndLib
+
+from inserts import export, threemf
+
+EPS = 1e-6
+
+Part = Union[cq.Workplane, cq.Shape]
+Rect = Tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class PlacedPart:
+    name: str
+    # Part as it lies on the plate.
+    shape: cq.Shape
+    rotated: bool
+
+
+@dataclass
+class Plate:
+    W: float
+    H: float
+    parts: List[PlacedPart] = field(default_factory=list)
+
+    def compound(self) -> cq.Compound:
+        return cq.Compound.makeCompound([p.shape for p in self.parts])
+
+
+def orient(part: Part) -> cq.Shape:
+    '''Lays @part on its print face, with its footprint's corner at the origin.
+
+    The print face is the planar face, or coplanar faces, of largest area
+    with nothing of the part below it.
+    '''
+    shape = part.val() if isinstance(part, cq.Workplane) else part
+
+    # Area of the planar faces on every plane (outward normal and offset).
+    areas: Dict[Tuple[Tuple[float, ...], float], float] = dict()
+    for face in shape.Faces():
+        if face.geomType() != 'PLANE':
+            continue
+        normal = face.normalAt()
+        key = (tuple(round(c, 6) for c in normal.toTuple()),
+               round(normal.dot(face.Center()), 6))
+        areas[key] = areas.get(key, 0) + face.Area()
+
+    for (normal, offset), _ in sorted(areas.items(), key=lambda kv: -kv[1]):
+        laid = _lay_down(shape, cq.Vector(*normal))
+        bb = _bounds(laid)
+        # The part turns about the origin, so the face ends up at -offset.
+        if bb.zmin >= -offset - EPS:
+            return laid.moved(cq.Location(
+                cq.Vector(-bb.xmin, -bb.ymin, -bb.zmin)))
+
+    bb = _bounds(shape)
+    return shape.moved(cq.Location(cq.Vector(-bb.xmin, -bb.ymin, -bb.zmin)))
+
+
+def arrange(parts: Mapping[str, Part],
+            W_bed: float, H_bed: float,
+            gap: float = 5,
+            rotatable: bool = True,
+            copies: Optional[Mapping[str, int]] = None,
+            ) -> List[Plate]:
+    '''Packs @parts, laid on their print faces, onto W_bed x H_bed plates.
+
+    Parts are kept @gap apart. @copies gives how many of a part to print
+    (default: one). Larger footprints are placed first, each on the first
+    plate with room for it.
+    '''
+    if copies is None:
+        copies = dict()
+    footprints = list()
+    for name, part in parts.items():
+        shape = orient(part)
+        bb = _bounds(shape)
+        if not _fits(bb.xlen, bb.ylen, W_bed, H_bed, rotatable):
+            raise ValueError(f'{name} ({bb.xlen:.1f} x {bb.ylen:.1f}) does '
+                             f'not fit on a {W_bed} x {H_bed} plate')
+        N = copies.get(name, 1)
+        for i in range(N):
+            footprints.append((name if N == 1 else f'{name} {i + 1}',
+                               shape, bb.xlen, bb.ylen))
+    footprints.sort(key=lambda f: (f[2] * f[3], max(f[2], f[3])),
+                    reverse=True)
+
+    # The gap is added to every footprint and to the plate, so that parts
+    # can still touch the edges of the bed.
+    plates: List[Tuple[Plate, List[Rect]]] = list()
+    for name, shape, W, H in footprints:
+        for plate, free in plates:
+            fit = _find(free, W + gap, H + gap, rotatable)
+            if fit is not None:
+                break
+        else:
+            plate = Plate(W_bed, H_bed)
+            free = [(0, 0, W_bed + gap, H_bed + gap)]
+            plates.append((plate, free))
+            fit = _find(free, W + gap, H + gap, rotatable)
+
+        x, y, rotated = fit
+        if rotated:
+            shape = shape.moved(cq.Location(cq.Vector(H, 0, 0),
+                                            cq.Vector(0, 0, 1), 90))
+            W, H = H, W
+        free[:] = _split(free, (x, y, W + gap, H + gap))
+        shape = shape.moved(cq.Location(
+            cq.Vector(x - W_bed / 2, y - H_bed / 2, 0)))
+        plate.parts.append(PlacedPart(name, shape, rotated))
+
+    return [plate for plate, _ in plates]
+
+
+def export_plates(plates: List[Plate], path: str) -> List[str]:
+    '''Exports every plate to @path formatted with its number (from 1).
+
+    3MF plates keep the names of their parts.
+    '''
+    paths = list()
+    for i, plate in enumerate(plates, 1):
+        plate_path = path.format(i)
+        if plate_path.lower().endswith('.3mf'):
+            model = threemf.Model()
+            for part in plate.parts:
+                model.add(part.shape, part.name)
+            export.export(model, plate_path)
+        else:
+            export.export(plate.compound(), plate_path)
+        paths.append(plate_path)
+    return paths
+
+
+def _bounds(shape: cq.Shape) -> cq.BoundBox:
+    '''Exact bounding box of @shape.
+
+    Shape.BoundingBox() uses the mesh of a shape once it has been exported,
+    which would move parts by the mesh tolerance from one run to the next.
+    '''
+    bb = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape.wrapped, bb, False, False)
+    return cq.BoundBox(bb)
+
+
+def _lay_down(shape: cq.Shape, normal: cq.Vector) -> cq.Shape:
+    '''Turns @shape about the origin so that @normal points down.'''
+    down = cq.Vector(0, 0, -1)
+    axis = normal.cross(down)
+    if axis.Length < EPS:
+        if normal.dot(down) > 0:
+            return shape
+        axis = cq.Vector(1, 0, 0)
+    angle = math.degrees(normal.getAngle(down))
+    return shape.moved(cq.Location(cq.Vector(), axis, angle))
+
+
+def _fits(W: float, H: float, W_bed: float, H_bed: float, rotatable: bool
+          ) -> bool:
+    return ((W <= W_bed + EPS and H <= H_bed + EPS)
+            or (rotatable and H <= W_bed + EPS and W <= H_bed + EPS))
+
+
+def _find(free: List[Rect], W: float, H: float, rotatable: bool
+          ) -> Optional[Tuple[float, float, bool]]:
+    '''Best short side fit of a W x H rectangle among @free rectangles.'''
+    best = None
+    for x, y, w, h in free:
+        for W_fit, H_fit, rotated in ((W, H, False), (H, W, True)):
+            if rotated and not rotatable:
+                continue
+            if W_fit > w + EPS or H_fit > h + EPS:
+                continue
+            score = (min(w - W_fit, h - H_fit), max(w - W_fit, h - H_fit))
+            if best is None or score < best[0]:
+                best = (score, x, y, rotated)
+    if best is None:
+        return None
+    return best[1:]
+
+
+def _split(free: List[Rect], used: Rect) -> List[Rect]:
+    '''Free rectangles left once @used is taken, none inside another.'''
+    ux, uy, uw, uh = used
+    rects = list()
+    for x, y, w, h in free:
+        if (ux >= x + w - EPS or ux + uw <= x + EPS
+                or uy >= y + h - EPS or uy + uh <= y + EPS):
+            rects.append((x, y, w, h))
+            continue
+        if ux > x + EPS:
+            rects.append((x, y, ux - x, h))
+        if ux + uw < x + w - EPS:
+            rects.append((ux + uw, y, x + w - ux - uw, h))
+        if uy > y + EPS:
+            rects.append((x, y, w, uy - y))
+        if uy + uh < y + h - EPS:
+            rects.append((x, uy + uh, w, y + h - uy - uh))
+
+    pruned = list()
+    for i, a in enumerate(rects):
+        if not any(_contains(b, a) and (not _contains(a, b) or j < i)
+                   for j, b in enumerate(rects) if j != i):
+            pruned.append(a)
+    return pruned
+
+
+def _contains(a: Rect, b: Rect) -> bool:
+    return (a[0] <= b[0] + EPS and a[1] <= b[1] + EPS
+            and b[0] + b[2] <= a[0] + a[2] + EPS
+            and b[1] + b[3] <= a[1] + a[3] + EPS)
@@ -0,0 +1,44 @@
+"""Cheap stand-ins for iterating on layouts.
+
+In preview mode components and builders return proxies instead of their
+solids: boxes or extruded outlines without lofts, fillets, text or icons.
+Placement can be checked in well under a second, while full fidelity is
+only built for export, which is skipped in preview mode.
+
+Enable it with INSERTS_PREVIEW=1, or for part of a script:
+
+    with preview.enabled():
+        show_object(layout.obj)
+"""
+
+import contextlib
+import os
+import cadquery as cq
+from typing import Iterator
+
+_active = os.environ.get('INSERTS_PREVIEW', '') not in ('', '0')
+
+
+def active() -> bool:
+    return _active
+
+
+@contextlib.contextmanager
+def enabled(on: bool = True) -> Iterator[None]:
+    '''Turns preview mode on (or off) within the block.'''
+    global _active
+    previous, _active = _active, on
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+def box(W: float, H: float, T: float) -> cq.Workplane:
+    '''Proxy of a W x H x T bounding box, centered on X & Y and on Z=0.'''
+    return cq.Workplane().box(W, H, T, centered=(True, True, False))
+
+
+def outline(sketch: cq.Sketch, T: float) -> cq.Workplane:
+    '''Proxy extruding @sketch by T from Z=0.'''
+    return cq.Workplane().placeSketch(sketch).extrude(T)
@@ -0,0 +1,199 @@
+"""Warm build server for the insert scripts.
+
+The server imports cadquery and the helpers once, warms OCCT up (meshing,
+fonts, exports) and forks a worker from that state for every request it
+receives on its Unix socket. Workers never see each other's state. Requests
+and replies are JSON lines; see inserts.daemon for the client.
+"""
+
+import base64
+import contextlib
+import importlib
+import io
+import json
+import os
+import runpy
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+import cadquery as cq
+from cadquery import exporters
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from inserts import cache, export, finish, preview, threemf
+from inserts.daemon import SETTINGS, SOCKET, Message, running, send
+
+# Modules imported before serving, when they are installed.
+PRELOAD = ['numpy', 'cq_gears', 'inserts.boxes', 'inserts.cardstack',
+           'inserts.catalog', 'inserts.packing', 'inserts.parallel',
+           'inserts.plates', 'inserts.vents']
+
+
+def serve(path: str = SOCKET, modules: Sequence[str] = PRELOAD) -> None:
+    '''Serves requests on the Unix socket @path until stopped.'''
+    if running(path):
+        raise RuntimeError(f'A server is already running on {path}')
+    preload(modules)
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    # Workers are reaped by the system.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    print(f'Serving on {path}', file=sys.stderr)
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                with conn.makefile('rb') as f:
+                    request = json.loads(f.readline() or 'null')
+                if request is None:
+                    continue
+                if request['type'] == 'stop':
+                    send(conn, {'type': 'done', 'seconds': 0})
+                    break
+                if os.fork() == 0:
+                    server.close()
+                    try:
+                        _work(conn, request)
+                    finally:
+                        os._exit(0)
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def _work(conn: socket.socket, request: Message) -> None:
+    # Scripts may wait for processes of their own (inserts.parallel).
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    start = time.monotonic()
+
+    def reply(message: Message) -> None:
+        send(conn, message)
+
+    try:
+        with _settings(request), _redirect(reply):
+            export.listeners.append(
+                lambda path, changed: reply({'type': 'export',
+                                             'path': os.path.abspath(path),
+                                             'changed': changed}))
+            export.reset_timer()
+            if request['type'] == 'run':
+                _run_script(request, reply)
+            else:
+                module, name = request['target'].split(':')
+                builder = getattr(importlib.import_module(module), name)
+                value = builder(*request['args'], **request['kwargs'])
+                reply({'type': 'value', 'brep': _encode(value)})
+    except BaseException:
+        reply({'type': 'error', 'traceback': traceback.format_exc()})
+    reply({'type': 'done', 'seconds': round(time.monotonic() - start, 3)})
+
+
+def _run_script(request: Message, reply: Callable[[Message], None]) -> None:
+    script = request['script']
+
+    def show_object(obj: Any, name: Optional[str] = None, *args, **kwargs
+                    ) -> None:
+        if request['show']:
+            reply({'type': 'show', 'name': name, 'brep': _encode(obj)})
+
+    sys.argv = [script] + request['args']
+    sys.path.insert(0, os.path.dirname(script))
+    try:
+        runpy.run_path(script, init_globals={'show_object': show_object},
+                       run_name=request['run_name'])
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise
+
+
+@contextlib.contextmanager
+def _settings(request: Message) -> Iterator[None]:
+    '''Runs within the client's directory, settings and PYTHONPATH.'''
+    env = request['env']
+    for name in SETTINGS:
+        if name in env:
+            os.environ[name] = env[name]
+        else:
+            os.environ.pop(name, None)
+    os.chdir(request['cwd'])
+    sys.path[:0] = [p for p in env.get('PYTHONPATH', '').split(os.pathsep)
+                    if p and p not in sys.path]
+    cache.set_store(env.get('INSERTS_CACHE_DIR') or None)
+    with (preview.enabled(_flag(env, 'INSERTS_PREVIEW')),
+          finish.skipped(_flag(env, 'INSERTS_NO_FINISH'))):
+        yield
+
+
+@contextlib.contextmanager
+def _redirect(reply: Callable[[Message], None]) -> Iterator[None]:
+    with (contextlib.redirect_stdout(_Stream(reply, 'stdout')),
+          contextlib.redirect_stderr(_Stream(reply, 'stderr'))):
+        yield
+
+
+class _Stream(io.TextIOBase):
+    '''Text stream sent to the client.'''
+
+    def __init__(self, reply: Callable[[Message], None], name: str) -> None:
+        self._reply = reply
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        self._reply({'type': self._name, 'data': data})
+        return len(data)
+
+
+def preload(modules: Sequence[str] = PRELOAD) -> None:
+    '''Imports @modules, when installed, and warms OCCT up.'''
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f'Not preloading {module}: {e}', file=sys.stderr)
+    _warm_up()
+
+
+def _warm_up() -> None:
+    '''Loads the parts of OCCT that are only loaded on first use.'''
+    part = (cq.Workplane()
+            .box(10, 10, 10)
+            .edges('|Z')
+            .fillet(1)
+            .faces('>Z')
+            .workplane()
+            .text('0', 5, -1, combine='cut')
+            )
+    with tempfile.TemporaryDirectory() as directory:
+        for ext in ('stl', 'step'):
+            exporters.export(part, os.path.join(directory, f'warm_up.{ext}'))
+    threemf.write(part, io.BytesIO())
+    cq.Shape.importBrep(io.BytesIO(base64.b64decode(_encode(part))))
+
+
+def _flag(env: Message, name: str) -> bool:
+    return env.get(name, '') not in ('', '0')
+
+
+def _encode(obj: Any) -> str:
+    if isinstance(obj, cq.Assembly):
+        shape = obj.toCompound()
+    elif isinstance(obj, cq.Workplane):
+        shapes = [v for v in obj.vals() if isinstance(v, cq.Shape)]
+        shape = (shapes[0] if len(shapes) == 1
+                 else cq.Compound.makeCompound(shapes))
+    else:
+        shape = obj
+    brep = io.BytesIO()
+    shape.exportBrep(brep)
+    return base64.b64encode(brep.getvalue()).decode()
@@ -0,0 +1,184 @@
+"""3MF files with every distinct mesh written once.
+
+Parts placed with .moved() or .located() share their geometry, and such
+copies are written as a single mesh referenced by one build item per copy,
+each with its own transform. Every item carries a name and optionally a
+colour for the slicer. Files are reproducible: the same parts always give
+the same bytes.
+
+    model = threemf.Model()
+    for i in range(4):
+        model.add(box.moved(cq.Location(cq.Vector(40 * i, 0, 0))),
+                  f'box {i}', color='#3050f0')
+    model.write('boxes.3mf')
+"""
+
+import io
+import cadquery as cq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Self, Tuple, Union
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+Part = Union[cq.Workplane, cq.Shape]
+
+NS_CORE = 'http://schemas.microsoft.com/3dmanufacturing/core/2015/02'
+NS_CONTENT_TYPES = ('http://schemas.openxmlformats.org/package/2006/'
+                    'content-types')
+NS_RELATIONSHIPS = ('http://schemas.openxmlformats.org/package/2006/'
+                    'relationships')
+TYPE_MODEL = 'application/vnd.ms-package.3dmanufacturing-3dmodel+xml'
+TYPE_RELATIONSHIPS = ('application/vnd.openxmlformats-package.'
+                      'relationships+xml')
+REL_MODEL = ('http://schemas.microsoft.com/3dmanufacturing/2013/01/'
+             '3dmodel')
+
+# Fixed timestamp of the files in the archive.
+DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass(frozen=True)
+class _Item:
+    name: str
+    mesh: int
+    transform: str
+
+
+class Model:
+    '''Parts to write to a 3MF file.'''
+
+    def __init__(self, tolerance: float = 0.1,
+                 angular_tolerance: float = 0.1) -> None:
+        self.tolerance = tolerance
+        self.angular_tolerance = angular_tolerance
+        # Named and coloured solids, one per item.
+        self.parts: List[Tuple[str, cq.Shape, Optional[str]]] = list()
+        # Meshes by shape (without location) and colour.
+        self._meshes: Dict[Tuple[cq.Shape, Optional[str]], int] = dict()
+        self._mesh_names: List[str] = list()
+        self._items: List[_Item] = list()
+
+    def add(self, part: Part, name: str, color: Optional[str] = None
+            ) -> Self:
+        '''Adds @part, named @name and coloured @color ('#RRGGBB').
+
+        Compounds are added as one item per solid.
+        '''
+        shape = part.val() if isinstance(part, cq.Workplane) else part
+        solids = shape.Solids() if isinstance(shape, cq.Compound) else [shape]
+        for i, solid in enumerate(solids):
+            key = (solid.located(cq.Location()), color)
+            mesh = self._meshes.get(key)
+            if mesh is None:
+                mesh = len(self._meshes)
+                self._meshes[key] = mesh
+                self._mesh_names.append(name)
+            item_name = name if len(solids) == 1 else f'{name} {i + 1}'
+            self.parts.append((item_name, solid, color))
+            self._items.append(_Item(item_name, mesh,
+                                     _transform(solid.location())))
+        return self
+
+    def write(self, path: Union[str, io.BytesIO]) -> None:
+        with ZipFile(path, 'w', ZIP_DEFLATED) as zf:
+            for name, data in [('[Content_Types].xml', _content_types()),
+                               ('_rels/.rels', _relationships()),
+                               ('3D/3dmodel.model', self._model())]:
+                info = ZipInfo(name, date_time=DATE_TIME)
+                info.compress_type = ZIP_DEFLATED
+                zf.writestr(info, data)
+
+    def _model(self) -> bytes:
+        colors = sorted({color for _, color in self._meshes if color})
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 f'<model unit="millimeter" xml:lang="en-US" '
+                 f'xmlns="{NS_CORE}">',
+                 '<resources>']
+        # Objects are numbered from 1: materials, meshes, then one object
+        # per item so that every copy keeps its own name.
+        materials_id = 1
+        if colors:
+            lines.append(f'<basematerials id="{materials_id}">')
+            for color in colors:
+                lines.append(f'<base name="{color}" '
+                             f'displaycolor="{color}"/>')
+            lines.append('</basematerials>')
+        mesh_id0 = materials_id + 1
+
+        for (shape, color), mesh in self._meshes.items():
+            material = ''
+            if color:
+                material = (f' pid="{materials_id}" '
+                            f'pindex="{colors.index(color)}"')
+            lines.append(f'<object id="{mesh_id0 + mesh}" '
+                         f'name="{_escape(self._mesh_names[mesh])}" '
+                         f'type="model"{material}>')
+            lines.extend(self._mesh(shape))
+            lines.append('</object>')
+
+        item_id0 = mesh_id0 + len(self._meshes)
+        for i, item in enumerate(self._items):
+            lines.append(f'<object id="{item_id0 + i}" '
+                         f'name="{_escape(item.name)}" type="model">'
+                         f'<components><component '
+                         f'objectid="{mesh_id0 + item.mesh}"/></components>'
+                         f'</object>')
+        lines.append('</resources>')
+
+        lines.append('<build>')
+        for i, item in enumerate(self._items):
+            lines.append(f'<item objectid="{item_id0 + i}" '
+                         f'transform="{item.transform}"/>')
+        lines.append('</build>')
+        lines.append('</model>')
+        return '\n'.join(lines).encode()
+
+    def _mesh(self, shape: cq.Shape) -> List[str]:
+        vertices, triangles = shape.tessellate(self.tolerance,
+                                               self.angular_tolerance)
+        lines = ['<mesh>', '<vertices>']
+        lines.extend(f'<vertex x="{v.x:.6f}" y="{v.y:.6f}" z="{v.z:.6f}"/>'
+                     for v in vertices)
+        lines.append('</vertices>')
+        lines.append('<triangles>')
+        lines.extend(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>'
+                     for a, b, c in triangles)
+        lines.append('</triangles>')
+        lines.append('</mesh>')
+        return lines
+
+
+def write(part: Part, path: Union[str, io.BytesIO], name: str = 'part',
+          color: Optional[str] = None) -> None:
+    '''Writes @part alone to a 3MF file.'''
+    Model().add(part, name, color).write(path)
+
+
+def _transform(location: cq.Location) -> str:
+    # 3MF transforms points as row vectors: the rotation is transposed and
+    # the translation comes last.
+    trsf = location.wrapped.Transformation()
+    values = [trsf.Value(row, col) for col in (1, 2, 3)
+              for row in (1, 2, 3)]
+    values += [trsf.Value(row, 4) for row in (1, 2, 3)]
+    return ' '.join(f'{v:.6f}' for v in values)
+
+
+def _escape(text: str) -> str:
+    return (text.replace('&', '&amp;').replace('"', '&quot;')
+            .replace('<', '&lt;').replace('>', '&gt;'))
+
+
+def _content_types() -> bytes:
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Types xmlns="{NS_CONTENT_TYPES}">'
+            f'<Default Extension="rels" ContentType="{TYPE_RELATIONSHIPS}"/>'
+            f'<Default Extension="model" ContentType="{TYPE_MODEL}"/>'
+            f'</Types>').encode()
+
+
+def _relationships() -> bytes:
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Relationships xmlns="{NS_RELATIONSHIPS}">'
+            f'<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+            f'Type="{REL_MODEL}"/>'
+            f'</Relationships>').encode()
@@ -0,0 +1,244 @@
+"""Vent patterns clipped in 2D.
+
+Patterns are laid out as convex cells (slots, hexagons or circles) and
+clipped against the vent area before any solid exists. Only the surviving
+cells are rounded, turned into faces and extruded in a single prism, so the
+vents take one boolean to cut from a wall.
+
+    cells = vents.diagonal(W, H, slot=7, wall=2.5,
+                           support=2.5, support_pitch=18)
+    box = box.cut(vents.make_vents(cells, T_wall, R=0.6))
+"""
+
+import math
+import cadquery as cq
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from OCP.BRepPrimAPI import BRepPrimAPI_MakePrism
+from OCP.gp import gp_Vec
+
+Point = Tuple[float, float]
+Polygon = List[Point]
+
+EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class Circle:
+    x: float
+    y: float
+    r: float
+
+
+Cell = Union[Polygon, Circle]
+
+
+def rectangle(W: float, H: float) -> Polygon:
+    '''Counter-clockwise W x H rectangle centered on the origin.'''
+    return [(-W / 2, -H / 2), (W / 2, -H / 2), (W / 2, H / 2), (-W / 2, H / 2)]
+
+
+def diagonal(W: float, H: float,
+             slot: float, wall: float,
+             angle: float = 45,
+             offset: float = 0,
+             support: Optional[float] = None,
+             support_pitch: Optional[float] = None,
+             support_angle: Optional[float] = None,
+             support_offset: float = 0,
+             ) -> List[Polygon]:
+    '''Parallel slots of width @slot, @wall apart, across a W x H area.
+
+    Slots run at @angle degrees from the X axis, one of them @offset away
+    from the center. With @support, they are crossed by bars of that width
+    every @support_pitch, running at @support_angle (default: perpendicular
+    to the slots), one of them @support_offset away from the center.
+    '''
+    area = rectangle(W, H)
+    slots = _strips(area, angle, slot, slot + wall, offset)
+    if support is None:
+        return [c for c in (_clip(area, s) for s in slots) if c]
+
+    if support_pitch is None:
+        raise ValueError('Supports need a pitch')
+    if support_angle is None:
+        support_angle = angle - 90
+    gaps = _strips(area, support_angle, support_pitch - support,
+                   support_pitch, support_offset + support_pitch / 2)
+    cells = list()
+    for s in slots:
+        for g in gaps:
+            cell = _clip(area, s + g)
+            if cell:
+                cells.append(cell)
+    return cells
+
+
+def hexagonal(W: float, H: float, size: float, wall: float
+              ) -> List[Polygon]:
+    '''Honeycomb of hexagons @size across flats, @wall apart.'''
+    area = rectangle(W, H)
+    R = size / math.sqrt(3)
+    hexagon = [(R * math.cos(math.radians(30 + 60 * i)),
+                R * math.sin(math.radians(30 + 60 * i))) for i in range(6)]
+    cells = list()
+    for x, y in _hex_lattice(W, H, size + wall, R):
+        cell = _clip([(x + px, y + py) for px, py in hexagon],
+                     _half_planes(area))
+        if cell:
+            cells.append(cell)
+    return cells
+
+
+def circular(W: float, H: float, D: float, wall: float) -> List[Circle]:
+    '''Holes of diameter @D, @wall apart, fully inside a W x H area.'''
+    r = D / 2
+    return [Circle(x, y, r) for x, y in _hex_lattice(W, H, D + wall, r)
+            if abs(x) + r <= W / 2 + EPS and abs(y) + r <= H / 2 + EPS]
+
+
+def make_vents(cells: Sequence[Cell], T: float, R: float = 0
+               ) -> cq.Workplane:
+    '''Extrudes @cells by @T along Z, with corners rounded by @R.
+
+    Cells whose sides are too short for @R are left out.
+    '''
+    faces = list()
+    for cell in cells:
+        if isinstance(cell, Circle):
+            wire = cq.Wire.makeCircle(cell.r, cq.Vector(cell.x, cell.y, 0),
+                                      cq.Vector(0, 0, 1))
+        else:
+            wire = _rounded_wire(cell, R)
+        if wire is not None:
+            faces.append(cq.Face.makeFromWires(wire))
+    if not faces:
+        return cq.Workplane()
+    prism = BRepPrimAPI_MakePrism(cq.Compound.makeCompound(faces).wrapped,
+                                  gp_Vec(0, 0, T))
+    return cq.Workplane(obj=cq.Shape.cast(prism.Shape()))
+
+
+def _strips(area: Polygon, angle: float, width: float, pitch: float,
+            offset: float = 0) -> List[List[Tuple[float, float, float]]]:
+    '''Strips of @width every @pitch at @angle covering @area.
+
+    Every strip is a pair of half-planes (a, b, c): a x + b y <= c. Strips
+    are centered on offset + i * pitch along the normal to @angle.
+    '''
+    nx = -math.sin(math.radians(angle))
+    ny = math.cos(math.radians(angle))
+    ds = [nx * x + ny * y for x, y in area]
+    i_min = math.floor((min(ds) - width / 2 - offset) / pitch)
+    i_max = math.ceil((max(ds) + width / 2 - offset) / pitch)
+    strips = list()
+    for i in range(i_min, i_max + 1):
+        d = offset + i * pitch
+        strips.append([(nx, ny, d + width / 2),
+                       (-nx, -ny, -(d - width / 2))])
+    return strips
+
+
+def _half_planes(polygon: Polygon) -> List[Tuple[float, float, float]]:
+    '''Half-planes whose intersection is the counter-clockwise @polygon.'''
+    planes = list()
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+        a, b = y2 - y1, x1 - x2
+        planes.append((a, b, a * x1 + b * y1))
+    return planes
+
+
+def _clip(polygon: Polygon, planes: List[Tuple[float, float, float]]
+          ) -> Optional[Polygon]:
+    '''Sutherland-Hodgman clipping of a convex @polygon by half-planes.'''
+    for a, b, c in planes:
+        clipped = list()
+        for p, q in zip(polygon, polygon[1:] + polygon[:1]):
+            dp = a * p[0] + b * p[1] - c
+            dq = a * q[0] + b * q[1] - c
+            if dp <= EPS:
+                clipped.append(p)
+            if (dp < -EPS and dq > EPS) or (dp > EPS and dq < -EPS):
+                s = dp / (dp - dq)
+                clipped.append((p[0] + s * (q[0] - p[0]),
+                                p[1] + s * (q[1] - p[1])))
+        polygon = _dedup(clipped)
+        if len(polygon) < 3:
+            return None
+    return polygon if _area(polygon) > EPS else None
+
+
+def _dedup(polygon: Polygon) -> Polygon:
+    points = list()
+    for p in polygon:
+        if not points or math.dist(p, points[-1]) > EPS:
+            points.append(p)
+    if len(points) > 1 and math.dist(points[0], points[-1]) <= EPS:
+        points.pop()
+    return points
+
+
+def _area(polygon: Polygon) -> float:
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2)
+               in zip(polygon, polygon[1:] + polygon[:1])) / 2
+
+
+def _hex_lattice(W: float, H: float, pitch: float, r: float
+                 ) -> List[Point]:
+    '''Hexagonal lattice points within @r of a W x H area.'''
+    dy = pitch * math.sqrt(3) / 2
+    n_x = math.ceil((W / 2 + r) / pitch) + 1
+    n_y = math.ceil((H / 2 + r) / dy) + 1
+    points = list()
+    for j in range(-n_y, n_y + 1):
+        x_offset = pitch / 2 if j % 2 else 0
+        for i in range(-n_x, n_x + 1):
+            x = i * pitch + x_offset
+            y = j * dy
+            if abs(x) <= W / 2 + r and abs(y) <= H / 2 + r:
+                points.append((x, y))
+    return points
+
+
+def _rounded_wire(polygon: Polygon, R: float) -> Optional[cq.Wire]:
+    n = len(polygon)
+    if R <= 0:
+        return cq.Wire.makePolygon(
+            [cq.Vector(x, y, 0) for x, y in polygon], close=True)
+
+    corners = list()
+    for i, v in enumerate(polygon):
+        p = polygon[i - 1]
+        q = polygon[(i + 1) % n]
+        u1 = _unit(p[0] - v[0], p[1] - v[1])
+        u2 = _unit(q[0] - v[0], q[1] - v[1])
+        half = math.acos(max(-1, min(1, u1[0] * u2[0] + u1[1] * u2[1]))) / 2
+        d = R / math.tan(half)
+        bisector = _unit(u1[0] + u2[0], u1[1] + u2[1])
+        c = R / math.sin(half)
+        start = (v[0] + u1[0] * d, v[1] + u1[1] * d)
+        end = (v[0] + u2[0] * d, v[1] + u2[1] * d)
+        middle = (v[0] + bisector[0] * (c - R), v[1] + bisector[1] * (c - R))
+        corners.append((d, start, middle, end))
+
+    # Both arcs of a side must fit on it.
+    for i in range(n):
+        side = math.dist(polygon[i], polygon[(i + 1) % n])
+        if corners[i][0] + corners[(i + 1) % n][0] > side + EPS:
+            return None
+
+    edges = list()
+    for i, (_, start, middle, end) in enumerate(corners):
+        edges.append(cq.Edge.makeThreePointArc(
+            cq.Vector(*start, 0), cq.Vector(*middle, 0), cq.Vector(*end, 0)))
+        next_start = corners[(i + 1) % n][1]
+        if math.dist(end, next_start) > EPS:
+            edges.append(cq.Edge.makeLine(cq.Vector(*end, 0),
+                                          cq.Vector(*next_start, 0)))
+    return cq.Wire.assembleEdges(edges)
+
+
+def _unit(x: float, y: float) -> Point:
+    length = math.hypot(x, y)
+    return (x / length, y / length)
@@ -0,0 +1,300 @@
+"""Rebuilds insert scripts when they, or what they use, change.
+
+    python -m inserts.watch [Clank-Catacombs Score-Counter ...]
+
+The scripts of the given directories (by default every game directory) are
+watched with the Python modules, DXF icons and CSV tables they use. Modules
+are followed through their imports; data files are used by the modules that
+name them. Scripts with a '__cq_main__' block run as cq-editor runs them,
+other scripts run unless another script imports them.
+
+Saving a file reruns only the scripts that depend on it, each in a process
+forked from one where cadquery and the helpers are already imported (see
+inserts.server). Modules edited since the watcher started are imported anew.
+inserts.export leaves parts whose geometry did not change alone, so only
+the models that changed are written. The terminal bell rings once a rebuild
+is done.
+"""
+
+import argparse
+import ast
+import os
+import runpy
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_EXTENSIONS = ('.dxf', '.csv')
+# Directories never watched, such as exported models.
+IGNORED = {'__pycache__', 'models'}
+# Seconds between polls, and to wait for the editor to finish writing.
+INTERVAL = 0.2
+SETTLE = 0.1
+
+
+@dataclass(frozen=True)
+class _Source:
+    imports: FrozenSet[str]  # Paths of the modules imported.
+    names: FrozenSet[str]  # File names of the data files named.
+    cq_main: bool
+
+
+class Graph:
+    '''Files of the repository and what every module uses.'''
+
+    def __init__(self, root: str = ROOT) -> None:
+        self.root = root
+        self.mtimes: Dict[str, float] = dict()
+        self._sources: Dict[Tuple[str, float], _Source] = dict()
+
+    def scan(self) -> Set[str]:
+        '''Updates the files and returns those added, changed or removed.'''
+        mtimes = dict()
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs
+                       if not d.startswith('.') and d not in IGNORED]
+            for name in files:
+                if name.endswith(('.py',) + DATA_EXTENSIONS):
+                    path = os.path.join(directory, name)
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime
+                    except FileNotFoundError:
+                        pass
+        changed = {path for path in mtimes.keys() | self.mtimes.keys()
+                   if mtimes.get(path) != self.mtimes.get(path)}
+        self.mtimes = mtimes
+        return changed
+
+    def source(self, path: str) -> _Source:
+        key = (path, self.mtimes[path])
+        if key not in self._sources:
+            self._sources[key] = self._parse(path)
+        return self._sources[key]
+
+    def dependencies(self, path: str) -> Set[str]:
+        '''Modules and data files @path uses, directly or not, and itself.'''
+        data: Dict[str, List[str]] = dict()
+        for p in self.mtimes:
+            if p.endswith(DATA_EXTENSIONS):
+                data.setdefault(os.path.basename(p), list()).append(p)
+
+        seen = set()
+        pending = [path]
+        while pending:
+            p = pending.pop()
+            if p in seen or p not in self.mtimes:
+                continue
+            seen.add(p)
+            if p.endswith('.py'):
+                source = self.source(p)
+                pending += source.imports
+                for name in source.names:
+                    seen.update(data.get(name, ()))
+        return seen
+
+    def scripts(self, directories: Sequence[str]) -> Dict[str, str]:
+        '''Scripts of @directories and the name they run as.'''
+        modules = [p for p in self.mtimes if p.endswith('.py')]
+        imported = {i for p in modules for i in self.source(p).imports}
+        scripts = dict()
+        for path in modules:
+            if not any(_within(path, d) for d in directories):
+                continue
+            if self.source(path).cq_main:
+                scripts[path] = '__cq_main__'
+            elif path not in imported:
+                scripts[path] = '__main__'
+        return scripts
+
+    def _parse(self, path: str) -> _Source:
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), path)
+        except (SyntaxError, ValueError):
+            return _Source(frozenset(), frozenset(), False)
+
+        roots = [os.path.dirname(path), self.project(path), self.root]
+        modules = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    package = path
+                    for _ in range(node.level):
+                        package = os.path.dirname(package)
+                    base = os.path.relpath(package, self.root).replace(
+                        os.sep, '.')
+                    base = '.'.join(filter(None, (base, node.module)))
+                else:
+                    base = node.module
+                modules.add(base)
+                modules.update(f'{base}.{alias.name}' for alias in node.names)
+
+        imports = set()
+        for module in modules:
+            # Importing a module imports its packages first.
+            parts = module.split('.')
+            for i in range(1, len(parts) + 1):
+                found = _find(parts[:i], roots)
+                if found is not None:
+                    imports.add(found)
+
+        names = frozenset(
+            os.path.basename(node.value) for node in ast.walk(tree)
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)
+            and node.value.endswith(DATA_EXTENSIONS))
+        cq_main = any(isinstance(node, ast.Constant)
+                      and node.value == '__cq_main__'
+                      for node in ast.walk(tree))
+        return _Source(frozenset(imports), names, cq_main)
+
+    def project(self, path: str) -> str:
+        '''Top directory of the repository holding @path.'''
+        relative = os.path.relpath(path, self.root).split(os.sep)
+        return os.path.join(self.root, relative[0])
+
+
+def watch(directories: Optional[Sequence[str]] = None,
+          processes: Optional[int] = None, bell: bool = True) -> None:
+    '''Rebuilds the scripts of @directories as their dependencies change.
+
+    At most @processes scripts (default: one per CPU) run at once.
+    '''
+    graph = Graph()
+    graph.scan()
+    if directories is None:
+        directories = sorted({graph.project(p) for p in graph.mtimes
+                              if os.path.dirname(p) != ROOT}
+                             - {os.path.join(ROOT, 'inserts')})
+    directories = [os.path.abspath(d) for d in directories]
+    print(f'Watching {len(graph.scripts(directories))} scripts in '
+          f'{", ".join(os.path.relpath(d) for d in directories)}')
+
+    from inserts import server
+    server.preload()
+    started = dict(graph.mtimes)
+    while True:
+        time.sleep(INTERVAL)
+        changed = graph.scan()
+        if not changed:
+            continue
+        # Editors may write a file in several steps.
+        time.sleep(SETTLE)
+        changed |= graph.scan()
+
+        scripts = {path: run_name
+                   for path, run_name in graph.scripts(directories).items()
+                   if graph.dependencies(path) & changed}
+        if not scripts:
+            continue
+        edited = {path for path in graph.mtimes.keys() | started.keys()
+                  if graph.mtimes.get(path) != started.get(path)}
+        stale = {path for path in graph.mtimes if path.endswith('.py')
+                 and graph.dependencies(path) & edited}
+        _rebuild(graph, scripts, stale, processes or os.cpu_count() or 1)
+        if bell:
+            print('\a', end='', flush=True)
+
+
+def _rebuild(graph: Graph, scripts: Dict[str, str], stale: Set[str],
+             processes: int) -> None:
+    start = time.monotonic()
+    pending = sorted(scripts.items())
+    running: Dict[int, str] = dict()
+    failed = list()
+    while pending or running:
+        while pending and len(running) < processes:
+            path, run_name = pending.pop(0)
+            pid = os.fork()
+            if pid == 0:
+                os._exit(_run(graph, path, run_name, stale))
+            running[pid] = path
+        pid, status = os.wait()
+        path = running.pop(pid)
+        if os.waitstatus_to_exitcode(status) != 0:
+            failed.append(path)
+
+    names = ', '.join(os.path.relpath(p, graph.root) for p in sorted(scripts))
+    print(f'{time.strftime("%H:%M:%S")} Rebuilt {names} in '
+          f'{time.monotonic() - start:.1f} s'
+          + (f', {len(failed)} failed' if failed else ''), flush=True)
+
+
+def _run(graph: Graph, path: str, run_name: str, stale: Set[str]) -> int:
+    '''Runs the script @path in a forked worker, returning its exit code.'''
+    try:
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, '__file__', None)
+            if file is None or os.path.abspath(file) not in stale:
+                continue
+            del sys.modules[name]
+            # Otherwise 'from package import module' finds the old one.
+            package, _, attribute = name.rpartition('.')
+            if package in sys.modules:
+                vars(sys.modules[package]).pop(attribute, None)
+
+        from inserts import export
+        export.reset_timer()
+        os.chdir(os.path.dirname(path))
+        sys.argv = [path]
+        sys.path[:0] = [os.path.dirname(path), graph.project(path),
+                        graph.root]
+        runpy.run_path(path, init_globals={'show_object': _show_object},
+                       run_name=run_name)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _show_object(*args, **kwargs) -> None:
+    pass
+
+
+def _find(parts: List[str], roots: Sequence[str]) -> Optional[str]:
+    for root in roots:
+        path = os.path.join(root, *parts)
+        if os.path.isfile(f'{path}.py'):
+            return f'{path}.py'
+        if os.path.isfile(os.path.join(path, '__init__.py')):
+            return os.path.join(path, '__init__.py')
+    return None
+
+
+def _within(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m inserts.watch',
+        description='Rebuilds insert scripts when their sources change.')
+    parser.add_argument('directories', nargs='*',
+                        help='directories of the scripts to rebuild '
+                             '(default: every game)')
+    parser.add_argument('-j', '--processes', type=int,
+                        help='scripts run at once (default: one per CPU)')
+    parser.add_argument('--no-bell', action='store_true',
+                        help='do not ring the bell after rebuilds')
+    args = parser.parse_args(argv)
+    try:
+        watch(args.directories or None, args.processes, not args.no_bell)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
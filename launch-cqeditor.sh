@@ -0,0 +1 @@
+PYTHONPATH=$(pwd):$PYTHONPATH cq-editor